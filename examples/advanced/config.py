@@ -1,17 +1,14 @@
 # -*- coding: utf-8 -*-
 
-from loguru import logger
-
 from onion_config import ConfigLoader
 
 from schema import ConfigSchema
 
 
-# Pre-load function to modify config data before loading and validation:
-def _pre_load_hook(config_data: dict) -> dict:
+# Pre-load function to modify config data in place before loading and validation:
+def _pre_load_hook(config_data: dict) -> None:
     config_data["app"]["port"] = "80"
     config_data["extra_val"] = "Something extra!"
-    return config_data
 
 
 config = None
@@ -27,5 +24,7 @@ try:
     # Main config object:
     config: ConfigSchema = _config_loader.load()
 except Exception:
+    from loguru import logger
+
     logger.exception("Failed to load config:")
     exit(2)
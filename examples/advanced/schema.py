@@ -3,17 +3,15 @@
 from enum import Enum
 from typing import Union
 
-import pydantic
 from pydantic import Field, SecretStr
 
-_has_pydantic_settings = False
-if "2.0.0" <= pydantic.__version__:
-    try:
-        from pydantic_settings import SettingsConfigDict
+# `pydantic-settings` is only available with pydantic-v2:
+try:
+    from pydantic_settings import SettingsConfigDict
 
-        _has_pydantic_settings = True
-    except ImportError:
-        pass
+    _has_pydantic_settings = True
+except ImportError:
+    _has_pydantic_settings = False
 
 from onion_config import BaseConfig
 
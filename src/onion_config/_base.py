@@ -2,45 +2,88 @@
 
 ## Standard libraries
 import os
-import glob
+import re
 import json
+import stat
+import time
 import copy
-from typing import Union, List, Callable, Type, Dict, Any
+from types import MappingProxyType
+from collections import OrderedDict
+from typing import Union, List, Callable, Type, Dict, Any, Tuple, FrozenSet, Mapping
 
 ## Third-party libraries
-import yaml
-from dotenv import load_dotenv
 from loguru import logger
 
-import pydantic
 from pydantic import BaseModel
 
-if "2.0.0" <= pydantic.__version__:
-    from pydantic import validate_call
 
+## Internal modules
+from ._consts import _PYDANTIC_V2, WarnEnum
+
+if _PYDANTIC_V2:
     try:
         from pydantic_settings import BaseSettings
     except ImportError:
         from pydantic.v1 import BaseSettings
 else:
     from pydantic import BaseSettings
-    from pydantic import validate_arguments as validate_call
 
-
-## Internal modules
-from ._consts import WarnEnum
-from ._utils import deep_merge
+from ._utils import (
+    deep_merge_inplace,
+    construct_model,
+    copy_data,
+    get_file_stat,
+    get_stat_key,
+    is_stat_settled,
+    get_model_input_keys,
+    is_json_data,
+    json_loads,
+    read_file_bytes,
+)
 from ._schemas import BaseConfig
 from .__version__ import __version__
 
 
+# `BaseConfig` is a subclass of `BaseSettings`, but `BaseSettings` is not a `pydantic.BaseModel` when it comes from `pydantic.v1`,
+# otherwise a single `BaseModel` check covers all of them:
+_MODEL_CLASSES = (
+    (BaseModel,) if issubclass(BaseSettings, BaseModel) else (BaseSettings, BaseModel)
+)
+# Least recently used loaded configs, limited by `ConfigLoader._LOADED_MAXSIZE`:
+_LOADED: "OrderedDict[tuple, Tuple[Dict[str, Any], Any]]" = OrderedDict()
+# Parsed config files are cached as read-only views, merging copies their mutable values.
+# Entries are checked by `get_stat_key()`, files changed within the last second are not cached:
+_PARSE_CACHE: Dict[str, Tuple[Tuple[int, int, int], Mapping[str, Any]]] = {}
+# Raw dotenv values are cached without expanding `${VAR}` references, because referenced variables can change:
+_ENV_CACHE: Dict[
+    str, Tuple[Tuple[int, int, int], Dict[str, Union[str, None]], bool]
+] = {}
+# Accepted top-level input keys of `config_schema` classes that ignore extra inputs:
+_SCHEMA_KEYS: Dict[type, Union[FrozenSet[str], None]] = {}
+# Config file paths of directories, directory modification time changes when files are added, removed or renamed:
+_SCAN_CACHE: Dict[str, Tuple[int, int, Tuple[str, ...]]] = {}
+# Cache file names in the 'ONION_CONFIG_CACHE_DIR' directory, other files are never pruned:
+_CACHE_FILE_PATTERN = re.compile(r"[0-9a-f]{32}\.json")
+_CWD = os.getcwd()
+
+
+def _identity_hook(config_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Default `pre_load_hook`, returns `config_data` as is."""
+
+    return config_data
+
+
 class ConfigLoader:
     """A core class of `onion_config` module to use as the main config loader.
 
     Attributes:
-        _ENV_FILE_PATH (str                       ): Default dotenv file path to load. Defaults to '${PWD}/.env'.
-        _CONFIGS_DIR   (str                       ): Default configs directory. Defaults to '${PWD}/configs'.
-        _PRE_LOAD_HOOK (function                  ): Default lambda function for `pre_load_hook`. Defaults to `lambda config_data: config_data`.
+        _ENV_FILE_PATH (str                       ): Default dotenv file path to load. Defaults to '${PWD}/.env' (working directory at import time).
+        _CONFIGS_DIR   (str                       ): Default configs directory. Defaults to '${PWD}/configs' (working directory at import time).
+        _PARALLEL_MIN_FILES (int                  ): Minimum number of files in a configs directory to parse them in parallel. Defaults to 4.
+        _MAX_WORKERS   (int                       ): Maximum number of threads to parse config files in parallel. Defaults to 8.
+        _LOADED_MAXSIZE (int                      ): Maximum number of loaded configs to cache for same inputs with `load(cache=True)`. Defaults to 32.
+        _CACHE_FILES_MAXSIZE (int                 ): Maximum number of cache files to keep in the 'ONION_CONFIG_CACHE_DIR' directory. Defaults to 32.
+        _PRE_LOAD_HOOK (function                  ): Default static identity function for `pre_load_hook`, skipped on load. Defaults to `_identity_hook`.
 
         config         (Union[BaseConfig,
                               BaseSettings,
@@ -53,26 +96,61 @@ class ConfigLoader:
         extra_dir      (str                       ): Extra configs directory to load extra config files. Defaults to None, but will use the 'ONION_CONFIG_EXTRA_DIR' environment variable if set.
         env_file_paths (str                       ): Dotenv file paths as <list> to load. Defaults to [ConfigLoader._ENV_FILE_PATH].
         required_envs  (str                       ): Required environment variables to check. Defaults to [].
-        pre_load_hook  (function                  ): Custom pre-load method, this method will executed before validating `config`. Defaults to `ConfigLoader._PRE_LOAD_HOOK`.
+        pre_load_hook  (function                  ): Custom pre-load method, this method will executed before validating `config`.
+                                                     It can return modified `config_data` or None after modifying it in place. Defaults to `ConfigLoader._PRE_LOAD_HOOK`.
         warn_mode      (WarnEnum                  ): Warning mode to handle warnings. Defaults to `WarnEnum.IGNORE`.
+        override_envs  (bool                      ): Override already existing environment variables with dotenv files or not. Defaults to True.
 
     Methods:
         load()                : Load and validate every configs into `config`.
+        clear_cache()         : Clear all cached loaded configs, parsed files and scanned directories.
+        _get_schema_data()    : Get `config_data` to init `config_schema` with.
+        _get_cache_key()      : Get the cache key of loaded `config` for the current loader state.
+        _get_abs_path()       : Get absolute path of a path relative to the current working directory.
+        _get_files_stats()    : Get path, modification time, change time and size of every dotenv and config file to load.
+        _get_cache_file_info(): Get the cache file path and files fingerprint of merged `config_data`.
+        _load_cache_file()    : Load merged `config_data` from the cache file, if it is up to date.
+        _save_cache_file()    : Save merged `config_data` into the cache file atomically.
+        _prune_cache_dir()    : Remove the oldest cache files above `_CACHE_FILES_MAXSIZE`.
         _load_dotenv_files()  : Load all dotenv files from `env_file_paths` into environment variables.
         _load_dotenv_file()   : Load each dotenv file into environment variables.
         _check_required_envs(): Check required environment variables are exist or not.
         _load_configs_dirs()  : Load all config files from `configs_dirs` into `config_data`.
         _load_configs_dir()   : Load config files from each config directory into `config_data`.
-        _load_yaml_file()     : Load each YAML config file into `config_data`.
-        _load_json_file()     : Load each JSON config file into `config_data`.
+        _get_config_file_paths(): Get sorted config file paths from a config directory.
+        _read_config_file()   : Read each config file by its extension.
+        _read_yaml_file()     : Read each YAML config file.
+        _read_json_file()     : Read each JSON config file.
         _load_extra_dir()     : Load extra config files from `extra_dir` into `config_data`.
+        _get_extra_dir()      : Get the extra configs directory to load, environment variable takes precedence.
+        _set_extra_dir()      : Set `extra_dir` from environment variable, if it is set and changed.
     """
 
-    _ENV_FILE_PATH = os.path.join(os.getcwd(), ".env")
-    _CONFIGS_DIR = os.path.join(os.getcwd(), "configs")
-    _PRE_LOAD_HOOK = lambda config_data: config_data
+    _ENV_FILE_PATH = os.path.join(_CWD, ".env")
+    _CONFIGS_DIR = os.path.join(_CWD, "configs")
+    _PRE_LOAD_HOOK = staticmethod(_identity_hook)
+    _PARALLEL_MIN_FILES = 4
+    _MAX_WORKERS = 8
+    _LOADED_MAXSIZE = 32
+    _CACHE_FILES_MAXSIZE = 32
+    _yaml_fallback_warned = False
+
+    # Private attributes (name mangled) of the properties, no per-instance `__dict__`:
+    __slots__ = (
+        "__config",
+        "__config_schema",
+        "__config_data",
+        "__configs_dirs",
+        "__env_file_paths",
+        "__required_envs",
+        "__pre_load_hook",
+        "__extra_dir",
+        "__warn_mode",
+        "__override_envs",
+        "__cwd",
+        "__weakref__",
+    )
 
-    @validate_call
     def __init__(
         self,
         config_schema: Union[
@@ -80,11 +158,12 @@ class ConfigLoader:
         ] = BaseConfig,
         configs_dirs: Union[List[str], str] = _CONFIGS_DIR,
         env_file_paths: Union[List[str], str] = _ENV_FILE_PATH,
-        required_envs: List[str] = [],
-        pre_load_hook: Callable = _PRE_LOAD_HOOK,
+        required_envs: Union[List[str], None] = None,
+        pre_load_hook: Callable = _identity_hook,
         extra_dir: Union[str, None] = None,
-        config_data: Dict[str, Any] = {},
+        config_data: Union[Dict[str, Any], None] = None,
         warn_mode: WarnEnum = WarnEnum.IGNORE,
+        override_envs: bool = True,
         auto_load: bool = False,
     ):
         """ConfigLoader constructor method.
@@ -95,28 +174,35 @@ class ConfigLoader:
                                   Type[BaseModel]    ], optional): Main config schema class to load and validate configs. Defaults to `BaseConfig`.
             configs_dirs   (Union[List[str], str]     , optional): Main configs directories as <list> or <str> to load all config files. Defaults to `ConfigLoader._CONFIGS_DIR`.
             env_file_paths (Union[List[str], str]     , optional): Dotenv file paths as <list> or <str> to load. Defaults to `ConfigLoader._ENV_FILE_PATH`.
-            required_envs  (List[str]                 , optional): Required environment variables to check. Defaults to [].
-            pre_load_hook  (function                  , optional): Custom pre-load method, this method will executed before validating `config`. Defaults to `ConfigLoader._PRE_LOAD_HOOK`.
+            required_envs  (Union[List[str], None]    , optional): Required environment variables to check. Defaults to None.
+            pre_load_hook  (function                  , optional): Custom pre-load method, this method will executed before validating `config`.
+                                                                 It can return modified `config_data` or None after modifying it in place. Defaults to `ConfigLoader._PRE_LOAD_HOOK`.
             extra_dir      (Union[str, None]          , optional): Extra configs directory to load extra config files. Defaults to None.
-            config_data    (dict                      , optional): Base config data as <dict> before everything. Defaults to {}.
+            config_data    (Union[dict, None]         , optional): Base config data as <dict> before everything. Defaults to None.
             warn_mode      (WarnEnum                  , optional): Warning mode to handle warnings. Defaults to `WarnEnum.IGNORE`.
+            override_envs  (bool                      , optional): Override already existing environment variables with dotenv files or not. Defaults to True.
             auto_load      (bool                      , optional): Auto load configs on init or not. Defaults to False.
         """
 
         self.config_schema = config_schema
         self.configs_dirs = configs_dirs
         self.env_file_paths = env_file_paths
-        self.required_envs = required_envs
+        if required_envs is not None:
+            self.required_envs = required_envs
         self.pre_load_hook = pre_load_hook
         if extra_dir:
             self.extra_dir = extra_dir
-        self.config_data = config_data
+        if config_data is not None:
+            self.config_data = config_data
         self.warn_mode = warn_mode
+        self.override_envs = override_envs
 
         if auto_load:
             self.load()
 
-    def load(self) -> Union[BaseConfig, BaseSettings, BaseModel]:
+    def load(
+        self, trusted: bool = False, force: bool = False, cache: bool = False
+    ) -> Union[BaseConfig, BaseSettings, BaseModel]:
         """Load and validate every configs into `config`.
         Load order:
             1.     Load all dotenv files from `env_file_paths` into environment variables.
@@ -124,11 +210,22 @@ class ConfigLoader:
             2.     Check if required environment variables exist or not.
             3.     Load all config files from `configs_dirs` into `config_data`.
             3.1.   Load config files from each config directory into `config_data`.
-            3.1.a. Load each YAML config file into `config_data`.
-            3.1.b. Load each JSON config file into `config_data`.
+            3.1.a. Read each config file by its extension.
+            3.1.b. Read each YAML config file.
+            3.1.c. Read each JSON config file.
             4.     Load extra config files from `extra_dir` into `config_data`.
-            5.     Execute `pre_load_hook` method to modify `config_data`.
+            3-4.   Or load merged `config_data` from the cache file, if 'ONION_CONFIG_CACHE_DIR' is set and the files are unchanged.
+            5.     Execute `pre_load_hook` method to modify `config_data` (in place if it returns None).
             6.     Init `config_schema` with `config_data` into final `config`.
+            3-6.   Or reuse already loaded `config` for the same inputs, if `cache` is True.
+
+        Args:
+            trusted (bool, optional): Construct `config` from trusted `config_data` without running validators.
+                                          Environment variables are not read by `config_schema` in this mode.
+                                          Ignored if the 'ONION_CONFIG_STRICT' environment variable is set. Defaults to False.
+            force   (bool, optional): Force to reload configs, even if the same configs are already loaded (cached). Defaults to False.
+            cache   (bool, optional): Reuse already loaded `config` for the same inputs, files and environment variables,
+                                          and cache the loaded `config` for the next loads. Defaults to False.
 
         Raises:
             Exception: If `pre_load_hook` method failed to execute.
@@ -138,84 +235,444 @@ class ConfigLoader:
             Union[BaseConfig, BaseSettings, BaseModel]: Main config object (based on `config_schema`) for project.
         """
 
+        # Cache current working directory once per load:
+        self.__cwd = os.getcwd()
+
         _message = "Loading all configs..."
-        if self.warn_mode == WarnEnum.ALWAYS:
+        if self.warn_mode is WarnEnum.ALWAYS:
             logger.info(_message)
-        elif self.warn_mode == WarnEnum.DEBUG:
+        elif self.warn_mode is WarnEnum.DEBUG:
             logger.debug(_message)
 
+        # Always load dotenv files and check required environment variables, even for cached configs:
         self._load_dotenv_files()
         self._check_required_envs()
-        self._load_configs_dirs()
-        self._load_extra_dir()
 
-        try:
-            # 5. Execute `pre_load_hook` method to modify `config_data`:
-            self.config_data: Dict[str, Any] = self.pre_load_hook(self.config_data)
-        except Exception:
-            logger.critical("Failed to execute `pre_load_hook` method:")
-            raise
+        # Strict mode always validates, also for cached configs:
+        trusted = trusted and (not os.getenv("ONION_CONFIG_STRICT"))
+
+        _cache_key = None
+        if cache:
+            _cache_key = self._get_cache_key(trusted=trusted)
+            if (not force) and (_cache_key in _LOADED):
+                _LOADED.move_to_end(_cache_key)
+                # Setters copy the cached `config_data` and `config`, so the caller can't modify the cache:
+                self.config_data, self.config = _LOADED[_cache_key]
+
+                _message = "Successfully loaded all configs!"
+                if self.warn_mode is WarnEnum.ALWAYS:
+                    logger.success(_message)
+                elif self.warn_mode is WarnEnum.DEBUG:
+                    logger.debug(_message)
+
+                return self.config
+
+        _cache_file_path, _fingerprint = self._get_cache_file_info()
+        if (not _cache_file_path) or (
+            not self._load_cache_file(_cache_file_path, _fingerprint)
+        ):
+            self._load_configs_dirs()
+            self._load_extra_dir()
+            if _cache_file_path:
+                self._save_cache_file(_cache_file_path, _fingerprint)
 
+        # Default `pre_load_hook` doesn't modify anything, skip it:
+        if self.pre_load_hook is not ConfigLoader._PRE_LOAD_HOOK:
+            try:
+                # 5. Execute `pre_load_hook` method to modify `config_data`:
+                _config_data = self.pre_load_hook(self.config_data)
+                # Hook returned None, `config_data` was modified in place:
+                if _config_data is not None:
+                    self.config_data: Dict[str, Any] = _config_data
+            except Exception:
+                logger.critical("Failed to execute `pre_load_hook` method:")
+                raise
+
+        # `config` is a new instance of already validated `config_schema`,
+        # so set it directly without the setter's type check and deep copy:
         try:
             # 6. Init `config_schema` with `config_data` into final `config`:
-
-            self.config: Union[
-                BaseConfig, BaseSettings, BaseModel
-            ] = self.config_schema(**self.config_data)
+            if trusted:
+                self.__config = construct_model(self.config_schema, self.config_data)
+            else:
+                self.__config: Union[
+                    BaseConfig, BaseSettings, BaseModel
+                ] = self.config_schema(**self._get_schema_data())
         except Exception:
             logger.critical("Failed to init `config_schema`:")
             raise
 
+        if _cache_key is not None:
+            # Returned `config` can be modified if `config_schema` is not frozen, cache a copy of it:
+            _LOADED[_cache_key] = (
+                copy_data(self.config_data),
+                copy.deepcopy(self.config),
+            )
+            while len(_LOADED) > ConfigLoader._LOADED_MAXSIZE:
+                _LOADED.popitem(last=False)
+
         _message = "Successfully loaded all configs!"
-        if self.warn_mode == WarnEnum.ALWAYS:
+        if self.warn_mode is WarnEnum.ALWAYS:
             logger.success(_message)
-        elif self.warn_mode == WarnEnum.DEBUG:
+        elif self.warn_mode is WarnEnum.DEBUG:
             logger.debug(_message)
 
         return self.config
 
+    @staticmethod
+    def clear_cache():
+        """Clear all cached loaded configs, parsed dotenv/config files and scanned config directories.
+        Next `load()` reads everything from files again.
+        """
+
+        _LOADED.clear()
+        _PARSE_CACHE.clear()
+        _ENV_CACHE.clear()
+        _SCAN_CACHE.clear()
+        _SCHEMA_KEYS.clear()
+
+    def _get_schema_data(self) -> Dict[str, Any]:
+        """Get `config_data` to init `config_schema` with.
+        If `config_schema` is a plain `BaseModel` that ignores extra inputs, unknown top-level keys are dropped beforehand.
+
+        Returns:
+            Dict[str, Any]: `config_data` or its copy without the ignored top-level keys.
+        """
+
+        _config_schema = self.config_schema
+        # `BaseSettings` also matches inputs by environment variable names and case-insensitively:
+        if issubclass(_config_schema, BaseSettings):
+            return self.config_data
+
+        if _config_schema not in _SCHEMA_KEYS:
+            _SCHEMA_KEYS[_config_schema] = get_model_input_keys(_config_schema)
+
+        _schema_keys = _SCHEMA_KEYS[_config_schema]
+        if (_schema_keys is None) or _schema_keys.issuperset(self.config_data):
+            return self.config_data
+
+        return {
+            _key: _val
+            for _key, _val in self.config_data.items()
+            if _key in _schema_keys
+        }
+
+    def _get_cache_key(self, trusted: bool = False) -> Union[tuple, None]:
+        """Get the cache key of loaded `config` for the current loader state.
+        Configs loaded with a custom `pre_load_hook`, or from files changed within the last second are not cached.
+        Values of `required_envs` are part of the key, `BaseSettings` schemas also read environment variables,
+        so all environment variables are part of their key.
+
+        Args:
+            trusted (bool, optional): Construct `config` without running validators. Defaults to False.
+
+        Returns:
+            Union[tuple, None]: Cache key, or None if the configs can't be cached.
+        """
+
+        if self.pre_load_hook is not ConfigLoader._PRE_LOAD_HOOK:
+            return None
+
+        try:
+            _config_data = json.dumps(self.config_data, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+
+        _files_stats = self._get_files_stats()
+        if not all(is_stat_settled(_file_stats[1:]) for _file_stats in _files_stats):
+            return None
+
+        _environ = None
+        if (not trusted) and issubclass(self.config_schema, BaseSettings):
+            _environ = frozenset(os.environ.items())
+
+        return (
+            self.config_schema,
+            _config_data,
+            tuple(self.configs_dirs),
+            tuple(self.env_file_paths),
+            self._get_extra_dir(),
+            tuple((_env, os.environ.get(_env)) for _env in self.required_envs),
+            self.warn_mode,
+            self.override_envs,
+            trusted,
+            tuple(_files_stats),
+            _environ,
+        )
+
+    def _get_abs_path(self, path: str) -> str:
+        """Get absolute path of a path relative to the current working directory.
+        Uses the working directory cached by `load()`, if it is available.
+
+        Args:
+            path (str, required): Path to get absolute path.
+
+        Returns:
+            str: Absolute path.
+        """
+
+        if os.path.isabs(path):
+            return path
+
+        try:
+            _cwd = self.__cwd
+        except AttributeError:
+            _cwd = os.getcwd()
+
+        return os.path.join(_cwd, path)
+
+    def _get_files_stats(self) -> List[Tuple[str, int, int, int]]:
+        """Get path, modification time, change time and size of every dotenv and config file to load.
+        Missing configs directories are marked with -1 modification time, change time and size.
+
+        Returns:
+            List[Tuple[str, int, int, int]]: List of (path, st_mtime_ns, st_ctime_ns, st_size) tuples.
+        """
+
+        _extra_dir = self._get_extra_dir()
+        _configs_dirs = list(self.configs_dirs)
+        if _extra_dir:
+            _configs_dirs.append(_extra_dir)
+
+        _files_stats = []
+        _file_paths = list(self.env_file_paths)
+        for _configs_dir in _configs_dirs:
+            _configs_dir = self._get_abs_path(_configs_dir)
+
+            _dir_file_paths = self._get_config_file_paths(configs_dir=_configs_dir)
+            if _dir_file_paths is not None:
+                _file_paths.extend(_dir_file_paths)
+            else:
+                _files_stats.append((_configs_dir, -1, -1, -1))
+
+        for _file_path in _file_paths:
+            _file_path = self._get_abs_path(_file_path)
+
+            _stat = get_file_stat(_file_path)
+            if _stat is not None:
+                _files_stats.append((_file_path, *get_stat_key(_stat)))
+
+        return _files_stats
+
+    def _get_cache_file_info(self) -> Tuple[Union[str, None], Union[list, None]]:
+        """Get the cache file path and files fingerprint of merged `config_data`.
+        Cache files are used only if the 'ONION_CONFIG_CACHE_DIR' environment variable is set.
+
+        Returns:
+            Tuple[Union[str, None], Union[list, None]]: Cache file path and files fingerprint, or (None, None) if disabled.
+        """
+
+        _cache_dir = os.getenv("ONION_CONFIG_CACHE_DIR")
+        if not _cache_dir:
+            return None, None
+
+        try:
+            _cache_name = json.dumps(
+                {
+                    "cwd": os.getcwd(),
+                    "config_data": self.config_data,
+                    "configs_dirs": self.configs_dirs,
+                    "extra_dir": self._get_extra_dir(),
+                    "warn_mode": self.warn_mode.value,
+                },
+                sort_keys=True,
+            )
+        except (TypeError, ValueError):
+            return None, None
+
+        import hashlib
+
+        _cache_file_path = os.path.join(
+            _cache_dir,
+            f"{hashlib.blake2b(_cache_name.encode('utf-8'), digest_size=16).hexdigest()}.json",
+        )
+        _fingerprint = [list(_file_stats) for _file_stats in self._get_files_stats()]
+        return _cache_file_path, _fingerprint
+
+    def _load_cache_file(self, cache_file_path: str, fingerprint: list) -> bool:
+        """Load merged `config_data` from the cache file, if it is up to date.
+
+        Args:
+            cache_file_path (str , required): Cache file path to load.
+            fingerprint     (list, required): Current fingerprint of dotenv and config files.
+
+        Returns:
+            bool: True if `config_data` is loaded from the cache file, False otherwise.
+        """
+
+        try:
+            _cache_data = json_loads(read_file_bytes(cache_file_path))
+        except (OSError, ValueError):
+            return False
+
+        if (not isinstance(_cache_data, dict)) or (
+            _cache_data.get("fingerprint") != fingerprint
+        ):
+            return False
+
+        self._set_extra_dir()
+        self.config_data = _cache_data["config_data"]
+        return True
+
+    def _save_cache_file(self, cache_file_path: str, fingerprint: list):
+        """Save merged `config_data` into the cache file atomically, then prune the oldest cache files.
+        Skipped if `config_data` is not plain JSON data, it would change when loaded back,
+        or if any file changed within the last second, a same-size rewrite could keep the same timestamps.
+
+        Args:
+            cache_file_path (str , required): Cache file path to save.
+            fingerprint     (list, required): Fingerprint of dotenv and config files before loading.
+        """
+
+        if not all(is_stat_settled(_file_stats[1:]) for _file_stats in fingerprint):
+            return
+
+        if not is_json_data(self.config_data):
+            return
+
+        _tmp_file_path = None
+        try:
+            _cache_json = json.dumps(
+                {"fingerprint": fingerprint, "config_data": self.config_data}
+            )
+
+            _cache_dir = os.path.dirname(cache_file_path)
+            os.makedirs(_cache_dir, exist_ok=True)
+            import tempfile
+
+            _fd, _tmp_file_path = tempfile.mkstemp(dir=_cache_dir, suffix=".tmp")
+            with os.fdopen(_fd, "w", encoding="utf-8") as _file:
+                _file.write(_cache_json)
+
+            os.replace(_tmp_file_path, cache_file_path)
+            _tmp_file_path = None
+            self._prune_cache_dir(cache_dir=_cache_dir)
+        except (OSError, TypeError, ValueError) as err:
+            _message = "Failed to save '{}' cache file: {}"
+            if self.warn_mode is WarnEnum.ALWAYS:
+                logger.warning(_message, cache_file_path, err)
+            elif self.warn_mode is WarnEnum.DEBUG:
+                logger.debug(_message, cache_file_path, err)
+        finally:
+            # Don't leave partially written temporary files behind:
+            if _tmp_file_path:
+                try:
+                    os.remove(_tmp_file_path)
+                except OSError:
+                    pass
+
+    def _prune_cache_dir(self, cache_dir: str):
+        """Remove the oldest cache files, if there are more than `_CACHE_FILES_MAXSIZE` of them.
+        Cache files are overwritten when config files change, new ones are only added for different loader inputs.
+
+        Args:
+            cache_dir (str, required): Cache directory to prune.
+        """
+
+        _cache_files = []
+        with os.scandir(cache_dir) as _entries:
+            for _entry in _entries:
+                if _CACHE_FILE_PATTERN.fullmatch(_entry.name) and _entry.is_file():
+                    try:
+                        _cache_files.append((_entry.stat().st_mtime_ns, _entry.path))
+                    except OSError:
+                        pass
+
+        if len(_cache_files) <= ConfigLoader._CACHE_FILES_MAXSIZE:
+            return
+
+        _cache_files.sort()
+        for _, _cache_file_path in _cache_files[: -ConfigLoader._CACHE_FILES_MAXSIZE]:
+            try:
+                os.remove(_cache_file_path)
+            except OSError:
+                # Already removed by another process:
+                pass
+
     def _load_dotenv_files(self):
-        """1. Load all dotenv files from `env_file_paths` into environment variables."""
+        """1. Load all dotenv files from `env_file_paths` into environment variables.
+        If `override_envs` is False, environment variables that existed before loading are skipped.
+        """
+
+        _skip_envs = frozenset()
+        if not self.override_envs:
+            _skip_envs = frozenset(os.environ)
 
         for _env_file_path in self.env_file_paths:
-            self._load_dotenv_file(env_file_path=_env_file_path)
+            self._load_dotenv_file(env_file_path=_env_file_path, skip_envs=_skip_envs)
 
-    @validate_call
-    def _load_dotenv_file(self, env_file_path: str):
+    def _load_dotenv_file(
+        self, env_file_path: str, skip_envs: FrozenSet[str] = frozenset()
+    ):
         """1.1. Load each dotenv file into environment variables.
+        Raw parsed values are cached by file path, modification time, change time and size, unchanged files are not parsed again.
+        `${VAR}` references are expanded on every load with the current environment variables.
 
         Args:
-            env_file_path (str, required): Dotenv file path to load.
+            env_file_path (str           , required): Dotenv file path to load.
+            skip_envs     (FrozenSet[str], optional): Environment variable names to skip. Defaults to frozenset().
         """
 
-        if not os.path.isabs(env_file_path):
-            env_file_path = os.path.join(os.getcwd(), env_file_path)
+        env_file_path = self._get_abs_path(env_file_path)
 
-        if os.path.isfile(env_file_path):
-            load_dotenv(dotenv_path=env_file_path, override=True, encoding="utf-8")
-        else:
+        _stat = get_file_stat(env_file_path)
+        if _stat is not None:
+            _stat_key = get_stat_key(_stat)
+            _cached = _ENV_CACHE.get(env_file_path)
+            if _cached and (_cached[0] == _stat_key):
+                _, _raw_values, _has_refs = _cached
+            else:
+                from dotenv import dotenv_values
+
+                _raw_values = dotenv_values(
+                    dotenv_path=env_file_path, encoding="utf-8", interpolate=False
+                )
+                _has_refs = any(("${" in _val) for _val in _raw_values.values() if _val)
+                # Don't cache recently changed files, timestamps have coarse granularity:
+                if is_stat_settled(_stat_key):
+                    _ENV_CACHE[env_file_path] = (_stat_key, _raw_values, _has_refs)
+
+            _env_values = _raw_values
+            if _has_refs:
+                from dotenv.main import resolve_variables
+
+                # Same precedence as python-dotenv, existing environment variables win if not overriding:
+                _env_values = resolve_variables(
+                    _raw_values.items(), override=self.override_envs
+                )
+
+            os.environ.update(
+                {
+                    _key: _val
+                    for _key, _val in _env_values.items()
+                    if (_val is not None) and (_key not in skip_envs)
+                }
+            )
+        elif self.warn_mode is not WarnEnum.IGNORE:
+            # Build the message only if it is used:
             _message = f"'{env_file_path}' file is not exist!"
-            if self.warn_mode == WarnEnum.ERROR:
+            if self.warn_mode is WarnEnum.ERROR:
                 raise FileNotFoundError(_message)
-            elif self.warn_mode == WarnEnum.ALWAYS:
+            elif self.warn_mode is WarnEnum.ALWAYS:
                 logger.warning(_message)
-            elif self.warn_mode == WarnEnum.DEBUG:
+            elif self.warn_mode is WarnEnum.DEBUG:
                 logger.debug(_message)
 
     def _check_required_envs(self):
         """2. Check if required environment variables exist or not.
-        If a required environment variable does not exist, raise an exception.
+        If any required environment variable does not exist, log all missing ones and raise an exception.
 
         Raises:
-            KeyError: If a required environment variable does not exist.
+            KeyError: If any required environment variable does not exist.
         """
 
-        for _env in self.required_envs:
-            try:
-                os.environ[_env]
-            except KeyError:
-                logger.critical(f"Missing required '{_env}' environment variable.")
-                raise
+        _environ = os.environ
+        _missing_envs = [_env for _env in self.required_envs if _env not in _environ]
+        if _missing_envs:
+            for _env in _missing_envs:
+                logger.critical("Missing required '{}' environment variable.", _env)
+
+            raise KeyError(_missing_envs[0])
 
     def _load_configs_dirs(self):
         """3. Load all config files from `configs_dirs` into `config_data`."""
@@ -223,112 +680,285 @@ class ConfigLoader:
         for _config_dir in self.configs_dirs:
             self._load_configs_dir(configs_dir=_config_dir)
 
-    @validate_call
     def _load_configs_dir(self, configs_dir: str):
         """3.1. Load config files from each config directory into `config_data`.
+        Unchanged files are taken from the parse cache, the rest are parsed in parallel threads
+        if there are at least `_PARALLEL_MIN_FILES` of them, then all are merged in sorted order.
 
         Args:
             configs_dir (str, required): Configs directory to load.
         """
 
-        if not os.path.isabs(configs_dir):
-            configs_dir = os.path.join(os.getcwd(), configs_dir)
-
-        if os.path.isdir(configs_dir):
-            _file_paths = []
-            _file_paths.extend(glob.glob(os.path.join(configs_dir, "*.yaml")))
-            _file_paths.extend(glob.glob(os.path.join(configs_dir, "*.yml")))
-            _file_paths.extend(glob.glob(os.path.join(configs_dir, "*.json")))
-            # _file_paths.extend(glob.glob(os.path.join(configs_dir, "*.toml")))
-            _file_paths.sort()
-
-            for _file_path in _file_paths:
-                if _file_path.lower().endswith((".yml", ".yaml")):
-                    self._load_yaml_file(file_path=_file_path)
-                elif _file_path.lower().endswith(".json"):
-                    self._load_json_file(file_path=_file_path)
-                # elif _file_path.lower().endswith(".toml"):
-                #     self._load_toml_file(file_path=_file_path)
-        else:
+        configs_dir = self._get_abs_path(configs_dir)
+
+        _file_paths = self._get_config_file_paths(configs_dir=configs_dir)
+        if _file_paths is not None:
+            _config_dicts = [
+                self._get_cached_config_file(file_path=_file_path)
+                for _file_path in _file_paths
+            ]
+            _uncached_indexes = [
+                _i
+                for _i, _config_dict in enumerate(_config_dicts)
+                if _config_dict is None
+            ]
+            if len(_uncached_indexes) >= ConfigLoader._PARALLEL_MIN_FILES:
+                from concurrent.futures import ThreadPoolExecutor
+
+                # Read and parse only uncached files concurrently, results keep the sorted order:
+                with ThreadPoolExecutor(
+                    max_workers=min(ConfigLoader._MAX_WORKERS, len(_uncached_indexes))
+                ) as _executor:
+                    for _i, _config_dict in zip(
+                        _uncached_indexes,
+                        _executor.map(
+                            self._read_config_file,
+                            [_file_paths[_i] for _i in _uncached_indexes],
+                        ),
+                    ):
+                        _config_dicts[_i] = _config_dict
+            else:
+                for _i in _uncached_indexes:
+                    _config_dicts[_i] = self._read_config_file(_file_paths[_i])
+
+            for _config_dict in _config_dicts:
+                if _config_dict:
+                    deep_merge_inplace(self.config_data, _config_dict)
+        elif self.warn_mode is not WarnEnum.IGNORE:
+            # Build the message only if it is used:
             _message = f"'{configs_dir}' directory is not exist!"
-            if self.warn_mode == WarnEnum.ERROR:
+            if self.warn_mode is WarnEnum.ERROR:
                 raise FileNotFoundError(_message)
-            elif self.warn_mode == WarnEnum.ALWAYS:
+            elif self.warn_mode is WarnEnum.ALWAYS:
                 logger.warning(_message)
-            elif self.warn_mode == WarnEnum.DEBUG:
+            elif self.warn_mode is WarnEnum.DEBUG:
                 logger.debug(_message)
 
-    @validate_call
-    def _load_yaml_file(self, file_path: str):
-        """3.1.a. Load each YAML config file into `config_data`.
+    def _get_config_file_paths(self, configs_dir: str) -> Union[List[str], None]:
+        """Get sorted config file paths from a config directory with a single directory scan.
+        Scanned paths are cached by directory path, modification time and inode.
+
+        Args:
+            configs_dir (str, required): Configs directory to scan.
+
+        Returns:
+            Union[List[str], None]: Sorted YAML and JSON config file paths, or None if the directory doesn't exist.
+        """
+
+        # Single `os.stat` call checks the directory and its modification time:
+        try:
+            _stat = os.stat(configs_dir)
+        except (OSError, ValueError):
+            return None
+
+        if not stat.S_ISDIR(_stat.st_mode):
+            return None
+
+        _cached = _SCAN_CACHE.get(configs_dir)
+        if _cached and (_cached[:2] == (_stat.st_mtime_ns, _stat.st_ino)):
+            return list(_cached[2])
+
+        _file_paths = []
+        with os.scandir(configs_dir) as _entries:
+            for _entry in _entries:
+                if (
+                    (not _entry.name.startswith("."))
+                    and _entry.name.endswith((".yaml", ".yml", ".json"))
+                    and _entry.is_file()
+                ):
+                    _file_paths.append(_entry.path)
+
+        _file_paths.sort()
+        # Don't cache recently modified directories, modification time has coarse granularity:
+        if (time.time_ns() - _stat.st_mtime_ns) > 1_000_000_000:
+            _SCAN_CACHE[configs_dir] = (
+                _stat.st_mtime_ns,
+                _stat.st_ino,
+                tuple(_file_paths),
+            )
+
+        return _file_paths
+
+    def _get_cached_config_file(self, file_path: str) -> Union[Mapping[str, Any], None]:
+        """Get parsed config data from the parse cache, if the config file is unchanged.
+
+        Args:
+            file_path (str, required): Config file path to look up.
+
+        Returns:
+            Union[Mapping[str, Any], None]: Cached config data, or None if the file is not cached or changed.
+        """
+
+        _cached = _PARSE_CACHE.get(file_path)
+        if _cached:
+            _stat = get_file_stat(file_path)
+            if (_stat is not None) and (_cached[0] == get_stat_key(_stat)):
+                return _cached[1]
+
+        return None
+
+    def _read_config_file(self, file_path: str) -> Mapping[str, Any]:
+        """3.1.a. Read each config file by its extension.
 
         Args:
-            file_path (str, required): YAML config file path to load.
+            file_path (str, required): Config file path to read.
+
+        Returns:
+            Mapping[str, Any]: Parsed config data, or {} for unsupported file types.
+        """
+
+        _ext = os.path.splitext(file_path)[1]
+        if _ext in (".yaml", ".yml"):
+            return self._read_yaml_file(file_path=file_path)
+        elif _ext == ".json":
+            return self._read_json_file(file_path=file_path)
+        # elif _ext == ".toml":
+        #     return self._read_toml_file(file_path=file_path)
+
+        return {}
+
+    def _read_yaml_file(self, file_path: str) -> Mapping[str, Any]:
+        """3.1.b. Read each YAML config file.
+        Parsed data is cached by file path, modification time, change time and size.
+
+        Args:
+            file_path (str, required): YAML config file path to read.
 
         Raises:
             Exception: If failed to load any YAML config file.
+
+        Returns:
+            Mapping[str, Any]: Parsed config data as a shared read-only view.
         """
 
-        if os.path.isfile(file_path):
-            try:
-                with open(file_path, "r", encoding="utf-8") as _file:
-                    _new_config_dict = yaml.safe_load(_file) or {}
-                    self.config_data = deep_merge(self.config_data, _new_config_dict)
-            except Exception:
-                logger.critical(f"Failed to load '{file_path}' YAML config file:")
-                raise
+        _stat = get_file_stat(file_path)
+        if _stat is None:
+            return {}
+
+        try:
+            _stat_key = get_stat_key(_stat)
+            _cached = _PARSE_CACHE.get(file_path)
+            if _cached and (_cached[0] == _stat_key):
+                return _cached[1]
+
+            import yaml
+
+            # Use libyaml C loader if available:
+            _loader = getattr(yaml, "CSafeLoader", None)
+            if _loader is None:
+                _loader = yaml.SafeLoader
+                # Warn only once per process:
+                _message = "PyYAML is built without libyaml, using the slower pure-Python YAML loader."
+                if not ConfigLoader._yaml_fallback_warned:
+                    if self.warn_mode is WarnEnum.ALWAYS:
+                        logger.warning(_message)
+                        ConfigLoader._yaml_fallback_warned = True
+                    elif self.warn_mode is WarnEnum.DEBUG:
+                        logger.debug(_message)
+                        ConfigLoader._yaml_fallback_warned = True
+
+            _new_config_dict = MappingProxyType(
+                yaml.load(read_file_bytes(file_path), Loader=_loader) or {}
+            )
+
+            if is_stat_settled(_stat_key):
+                _PARSE_CACHE[file_path] = (_stat_key, _new_config_dict)
+            return _new_config_dict
+        except Exception:
+            logger.critical("Failed to load '{}' YAML config file:", file_path)
+            raise
 
-    @validate_call
-    def _load_json_file(self, file_path: str):
-        """3.1.b. Load each JSON config file into `config_data`.
+    def _read_json_file(self, file_path: str) -> Mapping[str, Any]:
+        """3.1.c. Read each JSON config file.
+        Parsed data is cached by file path, modification time, change time and size.
 
         Args:
-            file_path (str, required): JSON config file path to load.
+            file_path (str, required): JSON config file path to read.
 
         Raises:
             Exception: If failed to load any JSON config file.
+
+        Returns:
+            Mapping[str, Any]: Parsed config data as a shared read-only view.
         """
 
-        if os.path.isfile(file_path):
-            try:
-                with open(file_path, "r", encoding="utf-8") as _file:
-                    _new_config_dict = json.load(_file) or {}
-                    self.config_data = deep_merge(self.config_data, _new_config_dict)
-            except Exception:
-                logger.critical(f"Failed to load '{file_path}' JSON config file:")
-                raise
+        _stat = get_file_stat(file_path)
+        if _stat is None:
+            return {}
 
-    # @validate_call
-    # def _load_toml_file(self, file_path: str):
-    #     """3.1.c. Load each TOML config file into `config_data`.
+        try:
+            _stat_key = get_stat_key(_stat)
+            _cached = _PARSE_CACHE.get(file_path)
+            if _cached and (_cached[0] == _stat_key):
+                return _cached[1]
+
+            _new_config_dict = MappingProxyType(
+                json_loads(read_file_bytes(file_path)) or {}
+            )
+
+            if is_stat_settled(_stat_key):
+                _PARSE_CACHE[file_path] = (_stat_key, _new_config_dict)
+            return _new_config_dict
+        except Exception:
+            logger.critical("Failed to load '{}' JSON config file:", file_path)
+            raise
+
+    # def _read_toml_file(self, file_path: str) -> Dict[str, Any]:
+    #     """3.1.d. Read each TOML config file.
 
     #     Args:
-    #         file_path (str, required): TOML config file path to load.
+    #         file_path (str, required): TOML config file path to read.
 
     #     Raises:
     #         Exception: If failed to load any TOML config file.
+
+    #     Returns:
+    #         Dict[str, Any]: Parsed config data.
     #     """
 
-    #     if os.path.isfile(file_path):
-    #         try:
-    #             import toml
+    #     if not os.path.isfile(file_path):
+    #         return {}
 
-    #             with open(file_path, "r", encoding="utf-8") as _file:
-    #                 _new_config_dict = toml.load(_file) or {}
-    #                 self.config_data = deep_merge(self.config_data, _new_config_dict)
-    #         except Exception:
-    #             logger.critical(f"Failed to load '{file_path}' TOML config file:")
-    #             raise
+    #     try:
+    #         import toml
+
+    #         with open(file_path, "r", encoding="utf-8") as _file:
+    #             return toml.load(_file) or {}
+    #     except Exception:
+    #         logger.critical("Failed to load '{}' TOML config file:", file_path)
+    #         raise
 
     def _load_extra_dir(self):
         """4. Load extra config files from `extra_dir` into `config_data`."""
 
-        _env_extra_dir = os.getenv("ONION_CONFIG_EXTRA_DIR")
-        if _env_extra_dir:
+        _extra_dir = self._set_extra_dir()
+        if not _extra_dir:
+            # Nothing to load:
+            return
+
+        self._load_configs_dir(configs_dir=_extra_dir)
+
+    def _get_extra_dir(self) -> Union[str, None]:
+        """Get the extra configs directory to load, 'ONION_CONFIG_EXTRA_DIR' environment variable takes precedence.
+
+        Returns:
+            Union[str, None]: Extra configs directory, or None if there is nothing to load.
+        """
+
+        return os.environ.get("ONION_CONFIG_EXTRA_DIR") or self.extra_dir
+
+    def _set_extra_dir(self) -> Union[str, None]:
+        """Set `extra_dir` from 'ONION_CONFIG_EXTRA_DIR' environment variable, if it is set and changed.
+
+        Returns:
+            Union[str, None]: Current `extra_dir`.
+        """
+
+        _env_extra_dir = os.environ.get("ONION_CONFIG_EXTRA_DIR")
+        if _env_extra_dir and (_env_extra_dir != self.extra_dir):
             self.extra_dir = _env_extra_dir
 
-        if self.extra_dir:
-            self._load_configs_dir(configs_dir=self.extra_dir)
+        return self.extra_dir
 
     ### ATTRIBUTES ###
 
@@ -342,11 +972,7 @@ class ConfigLoader:
 
     @config.setter
     def config(self, config: Union[BaseConfig, BaseSettings, BaseModel]):
-        if (
-            (not isinstance(config, BaseConfig))
-            and (not isinstance(config, BaseSettings))
-            and (not isinstance(config, BaseModel))
-        ):
+        if not isinstance(config, _MODEL_CLASSES):
             raise TypeError(
                 f"`config` attribute type {type(config)} is invalid, must be a <class 'BaseConfig'> or `pydantic` <class 'BaseSettings'> or <class 'BaseModel'>."
             )
@@ -377,11 +1003,7 @@ class ConfigLoader:
             raise TypeError("`config_schema` must be a class, not an instance.")
 
         # Check if config_schema is a subclass of BaseConfig, BaseSettings or BaseModel
-        if (
-            (not issubclass(config_schema, BaseConfig))
-            and (not issubclass(config_schema, BaseSettings))
-            and (not issubclass(config_schema, BaseModel))
-        ):
+        if not issubclass(config_schema, _MODEL_CLASSES):
             _base_class = ""
             if hasattr(config_schema, "__base__"):
                 _base_class = config_schema.__base__
@@ -413,7 +1035,12 @@ class ConfigLoader:
                 f"`config_data` attribute type {type(config_data)} is invalid, must be a <dict>."
             )
 
-        self.__config_data = copy.deepcopy(config_data)
+        # Nothing to copy for an empty dict:
+        if not config_data:
+            self.__config_data = {}
+            return
+
+        self.__config_data = copy_data(config_data)
 
     ## config_data ##
 
@@ -441,7 +1068,7 @@ class ConfigLoader:
 
             configs_dirs = [configs_dirs]
         else:
-            configs_dirs = copy.deepcopy(configs_dirs)
+            configs_dirs = list(configs_dirs)
 
         if not all(isinstance(_val, str) for _val in configs_dirs):
             raise ValueError(
@@ -504,7 +1131,7 @@ class ConfigLoader:
 
             env_file_paths = [env_file_paths]
         else:
-            env_file_paths = copy.deepcopy(env_file_paths)
+            env_file_paths = list(env_file_paths)
 
         if not all(isinstance(_val, str) for _val in env_file_paths):
             raise ValueError(
@@ -537,7 +1164,7 @@ class ConfigLoader:
                 f"'required_envs' attribute value {required_envs} is invalid, must be a list of <str>!"
             )
 
-        self.__required_envs = copy.deepcopy(required_envs)
+        self.__required_envs = list(required_envs)
 
     ## required_envs ##
 
@@ -585,7 +1212,27 @@ class ConfigLoader:
                     f"'warn_mode' attribute value '{warn_mode}' is invalid, must be a <enum 'WarnEnum'> or 'ERROR', 'ALWAYS', 'DEBUG', 'IGNORE'!"
                 )
 
+        # Always an enum member (singleton), so it is compared by identity:
         self.__warn_mode = warn_mode
 
     ## warn_mode ##
+
+    ## override_envs ##
+    @property
+    def override_envs(self) -> bool:
+        try:
+            return self.__override_envs
+        except AttributeError:
+            return True
+
+    @override_envs.setter
+    def override_envs(self, override_envs: bool):
+        if not isinstance(override_envs, bool):
+            raise TypeError(
+                f"'override_envs' attribute type {type(override_envs)} is invalid, must be a <bool>!"
+            )
+
+        self.__override_envs = override_envs
+
+    ## override_envs ##
     ### ATTRIBUTES ###
@@ -2,6 +2,10 @@
 
 from enum import Enum
 
+import pydantic
+
+_PYDANTIC_V2 = int(pydantic.VERSION.split(".", 1)[0]) >= 2
+
 
 class WarnEnum(str, Enum):
     ERROR = "ERROR"
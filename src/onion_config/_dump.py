@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+# `msgspec` module, resolved lazily on the first `format_config` call: None if not resolved yet, False if not installed.
+_msgspec: Any = None
+
+
+def _get_msgspec() -> Any:
+    """Import `msgspec` once, on the first call.
+
+    Returns:
+        Any: `msgspec` module, or False if it is not installed.
+    """
+
+    global _msgspec
+
+    if _msgspec is None:
+        try:
+            import msgspec
+
+            _msgspec = msgspec
+        except ImportError:
+            _msgspec = False
+
+    return _msgspec
+
+
+def format_config(config: BaseModel) -> str:
+    """Format a config object as a pretty JSON string (2-space indent) for printing or logging.
+    Uses `msgspec` to encode JSON if it is installed, otherwise falls back to `json`.
+    Both have the same layout, but float formatting can differ (e.g. `1e20` with `msgspec`, `1e+20` with `json`).
+
+    Args:
+        config (BaseModel, required): Config object (based on `BaseConfig`, `BaseSettings` or `BaseModel`) to format.
+
+    Returns:
+        str: Formatted config string.
+    """
+
+    if hasattr(config, "model_dump"):
+        # Pydantic-v2:
+        _config_data = config.model_dump(mode="json")
+    else:
+        # Pydantic-v1:
+        _config_data = json.loads(config.json())
+
+    _msgspec_module = _get_msgspec()
+    if _msgspec_module:
+        return _msgspec_module.json.format(
+            _msgspec_module.json.encode(_config_data)
+        ).decode("utf-8")
+
+    return json.dumps(_config_data, indent=2, ensure_ascii=False)
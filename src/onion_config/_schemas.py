@@ -1,56 +1,12 @@
 # -*- coding: utf-8 -*-
 
-from typing import Tuple, Type
+from ._consts import _PYDANTIC_V2
 
-import pydantic
-
-_has_pydantic_settings = False
-if "2.0.0" <= pydantic.__version__:
+if _PYDANTIC_V2:
     try:
-        from pydantic_settings import (
-            BaseSettings,
-            SettingsConfigDict,
-            PydanticBaseSettingsSource,
-        )
-
-        _has_pydantic_settings = True
+        from ._schemas_v2 import BaseConfig
     except ImportError:
-        from pydantic.v1 import BaseSettings
-        from pydantic.v1.env_settings import SettingsSourceCallable
+        # `pydantic-settings` is not installed, fallback to `pydantic.v1`:
+        from ._schemas_v1 import BaseConfig
 else:
-    from pydantic import BaseSettings
-    from pydantic.env_settings import SettingsSourceCallable
-
-
-class BaseConfig(BaseSettings):
-    if _has_pydantic_settings:
-        model_config = SettingsConfigDict(
-            extra="allow", frozen=True, arbitrary_types_allowed=True
-        )
-
-        @classmethod
-        def settings_customise_sources(
-            cls,
-            settings_cls: Type[BaseSettings],
-            init_settings: PydanticBaseSettingsSource,
-            env_settings: PydanticBaseSettingsSource,
-            dotenv_settings: PydanticBaseSettingsSource,
-            file_secret_settings: PydanticBaseSettingsSource,
-        ) -> Tuple[PydanticBaseSettingsSource, ...]:
-            return dotenv_settings, env_settings, init_settings, file_secret_settings
-
-    else:
-
-        class Config:
-            extra = "allow"
-            frozen = True
-            arbitrary_types_allowed = True
-
-            @classmethod
-            def customise_sources(
-                cls,
-                init_settings: SettingsSourceCallable,
-                env_settings: SettingsSourceCallable,
-                file_secret_settings: SettingsSourceCallable,
-            ) -> tuple[SettingsSourceCallable, ...]:
-                return env_settings, init_settings, file_secret_settings
+    from ._schemas_v1 import BaseConfig
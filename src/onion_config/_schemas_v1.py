@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+from typing import Tuple
+
+from ._consts import _PYDANTIC_V2
+
+if _PYDANTIC_V2:
+    from pydantic.v1 import BaseSettings
+    from pydantic.v1.env_settings import SettingsSourceCallable
+else:
+    from pydantic import BaseSettings
+    from pydantic.env_settings import SettingsSourceCallable
+
+
+class BaseConfig(BaseSettings):
+    class Config:
+        extra = "allow"
+        frozen = True
+        arbitrary_types_allowed = True
+
+        @classmethod
+        def customise_sources(
+            cls,
+            init_settings: SettingsSourceCallable,
+            env_settings: SettingsSourceCallable,
+            file_secret_settings: SettingsSourceCallable,
+        ) -> Tuple[SettingsSourceCallable, ...]:
+            return env_settings, init_settings, file_secret_settings
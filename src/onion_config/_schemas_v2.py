@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+from typing import Tuple, Type
+
+from pydantic_settings import (
+    BaseSettings,
+    SettingsConfigDict,
+    PydanticBaseSettingsSource,
+)
+
+
+class BaseConfig(BaseSettings):
+    model_config = SettingsConfigDict(
+        extra="allow",
+        frozen=True,
+        arbitrary_types_allowed=True,
+        defer_build=True,
+    )
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: Type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        return dotenv_settings, env_settings, init_settings, file_secret_settings
@@ -1,37 +1,396 @@
 # -*- coding: utf-8 -*-
 
+import os
+import re
 import copy
+import json
+import stat
+import time
+import types
+from typing import (
+    Any,
+    Dict,
+    Type,
+    Mapping,
+    Union,
+    FrozenSet,
+    Tuple,
+    get_args,
+    get_origin,
+)
 
-import pydantic
+try:
+    from orjson import loads as _orjson_loads
+except ImportError:
+    _orjson_loads = None
 
-if "2.0.0" <= pydantic.__version__:
-    from pydantic import validate_call
-else:
-    from pydantic import validate_arguments as validate_call
 
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+# `X | Y` unions are `types.UnionType` since Python 3.10:
+_UNION_TYPES = (Union, getattr(types, "UnionType", Union))
+# Integers with 19+ digits may not fit into 64 bits, `orjson` parses them as lossy floats:
+_LONG_DIGITS_PATTERN = re.compile(rb"\d{19,}")
 
-@validate_call
-def deep_merge(dict1: dict, dict2: dict) -> dict:
-    """Return a new dictionary that's the result of a deep merge of two dictionaries.
+
+def _copy_value(val: Any) -> Any:
+    """Return a deep copy of a value, or the value itself if it is immutable.
+
+    Args:
+        val (Any, required): The value to copy.
+
+    Returns:
+        Any: The copied (or same immutable) value.
+    """
+
+    if type(val) in _IMMUTABLE_TYPES:
+        return val
+
+    return copy.deepcopy(val)
+
+
+def deep_merge_inplace(dict1: dict, dict2: Mapping) -> None:
+    """Deep merge `dict2` into `dict1` in place, without rebuilding `dict1`.
     If there are conflicts, values from `dict2` will overwrite those in `dict1`.
+    Immutable values from `dict2` are shared by reference, other values are copied, so `dict2` is never modified through `dict1`.
+
+    Args:
+        dict1 (dict   , required): The base dictionary to merge into.
+        dict2 (Mapping, required): The dictionary (or read-only mapping) to merge into `dict1`.
+    """
+
+    # Merge nested dictionaries iteratively with an explicit stack instead of recursion:
+    _stack = [(dict1, dict2)]
+    while _stack:
+        _dst, _src = _stack.pop()
+        for _key, _val in _src.items():
+            if isinstance(_val, dict):
+                _dst_val = _dst.get(_key)
+                if not isinstance(_dst_val, dict):
+                    # Nothing to merge into, copy dictionary subclasses as they are:
+                    if type(_val) is not dict:
+                        _dst[_key] = _copy_value(_val)
+                        continue
+
+                    _dst_val = _dst[_key] = {}
+
+                if _val:
+                    _stack.append((_dst_val, _val))
+            else:
+                _dst[_key] = _copy_value(_val)
+
+
+def get_file_stat(file_path: str) -> Union[os.stat_result, None]:
+    """Get the stat of a regular file with a single `os.stat` call, instead of `os.path.isfile` and `os.stat`.
+
+    Args:
+        file_path (str, required): File path to stat.
+
+    Returns:
+        Union[os.stat_result, None]: File stat, or None if the file doesn't exist or isn't a regular file.
+    """
+
+    try:
+        _stat = os.stat(file_path)
+    except (OSError, ValueError):
+        return None
+
+    if not stat.S_ISREG(_stat.st_mode):
+        return None
+
+    return _stat
+
+
+def get_stat_key(file_stat: os.stat_result) -> Tuple[int, int, int]:
+    """Get the key to check if a cached file is unchanged, its modification time, change time and size.
+    Change time is updated on every write, even if the modification time is set back with `os.utime`.
+
+    Args:
+        file_stat (os.stat_result, required): File stat.
+
+    Returns:
+        Tuple[int, int, int]: (st_mtime_ns, st_ctime_ns, st_size) tuple.
+    """
+
+    return file_stat.st_mtime_ns, file_stat.st_ctime_ns, file_stat.st_size
+
+
+def is_stat_settled(stat_key: Tuple[int, int, int]) -> bool:
+    """Check if a file wasn't changed within the last second, so it is safe to cache by its stat.
+    Timestamps have coarse granularity, a file rewritten with the same size within the same tick keeps the same stat.
+
+    Args:
+        stat_key (Tuple[int, int, int], required): File stat key from `get_stat_key()`.
+
+    Returns:
+        bool: True if the file was changed more than a second ago, False otherwise.
+    """
+
+    return (time.time_ns() - max(stat_key[0], stat_key[1])) > 1_000_000_000
+
+
+def read_file_bytes(file_path: str) -> bytes:
+    """Read a whole file as raw bytes with a single `os.read` call, without text decoding.
+
+    Args:
+        file_path (str, required): File path to read.
+
+    Returns:
+        bytes: File content.
+    """
+
+    _fd = os.open(file_path, os.O_RDONLY)
+    try:
+        _size = os.fstat(_fd).st_size
+        _content = os.read(_fd, _size + 1)
+        if len(_content) <= _size:
+            return _content
+
+        # The file grew after `os.fstat`, read the rest of it:
+        _chunks = [_content]
+        while _chunks[-1]:
+            _chunks.append(os.read(_fd, 65536))
+
+        return b"".join(_chunks)
+    finally:
+        os.close(_fd)
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON bytes with `orjson` if it is installed, the same as `json.loads` would.
+    Falls back to `json.loads` for data `orjson` rejects (e.g. NaN or Infinity),
+    and for data with long digit runs that could be integers wider than 64 bits.
+
+    Args:
+        data (bytes, required): JSON data to parse.
+
+    Raises:
+        ValueError: If `data` is not a valid JSON.
+
+    Returns:
+        Any: Parsed data.
+    """
+
+    if (_orjson_loads is not None) and (not _LONG_DIGITS_PATTERN.search(data)):
+        try:
+            return _orjson_loads(data)
+        except ValueError:
+            pass
+
+    return json.loads(data)
+
+
+def copy_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a deep copy of a dictionary.
+    Plain dictionaries and lists are copied recursively and immutable values are shared, which is much faster than `copy.deepcopy`.
+    Other values (e.g. Enum members, tuples, sets or objects) are copied with `copy.deepcopy`, so their types are preserved.
+
+    Args:
+        data (Dict[str, Any], required): The dictionary to copy.
+
+    Returns:
+        Dict[str, Any]: The copied dictionary.
+    """
+
+    return _copy_data(data)
+
+
+def _copy_data(val: Any) -> Any:
+    """Recursive part of `copy_data`.
+
+    Args:
+        val (Any, required): The value to copy.
+
+    Returns:
+        Any: The copied (or same immutable) value.
+    """
+
+    _type = type(val)
+    if _type is dict:
+        return {_key: _copy_data(_val) for _key, _val in val.items()}
+
+    if _type is list:
+        return [_copy_data(_val) for _val in val]
+
+    return _copy_value(val)
+
+
+def is_json_data(data: Any) -> bool:
+    """Check if data consists only of plain JSON types, so it can be stored as JSON without changes.
+    Types are checked exactly, e.g. Enum members, tuples or dictionary subclasses are not plain JSON.
+
+    Args:
+        data (Any, required): The data to check.
+
+    Returns:
+        bool: True if data is plain JSON data, False otherwise.
+    """
+
+    _type = type(data)
+    if _type is dict:
+        return all(
+            (type(_key) is str) and is_json_data(_val) for _key, _val in data.items()
+        )
+
+    if _type is list:
+        return all(is_json_data(_val) for _val in data)
+
+    return _type in _IMMUTABLE_TYPES
+
+
+def _get_model_fields(model_cls: Type[Any]) -> Dict[str, Any]:
+    """Return the fields of a Pydantic model class (Pydantic-v1 or Pydantic-v2).
+
+    Args:
+        model_cls (Type[Any], required): Pydantic model class.
+
+    Returns:
+        Dict[str, Any]: Field name to field info mapping.
+    """
+
+    if hasattr(model_cls, "model_fields"):
+        return model_cls.model_fields
+
+    return model_cls.__fields__
+
+
+def get_model_input_keys(model_cls: Type[Any]) -> Union[FrozenSet[str], None]:
+    """Return the input keys (field names and aliases) a Pydantic model class accepts, if it ignores extra inputs.
+
+    Args:
+        model_cls (Type[Any], required): Pydantic model class.
+
+    Returns:
+        Union[FrozenSet[str], None]: Accepted input keys, or None if extra inputs are allowed or forbidden,
+                                         or the accepted keys can't be known in advance (e.g. alias generators or alias paths),
+                                         or the raw input can be read by custom code (before/wrap validators or `__init__`).
+    """
+
+    # Custom `__init__` receives all input keys:
+    if model_cls.__init__.__module__.split(".", 1)[0] != "pydantic":
+        return None
+
+    if hasattr(model_cls, "model_config"):
+        # Pydantic-v2:
+        _config = model_cls.model_config
+        _extra = _config.get("extra")
+        _alias_generator = _config.get("alias_generator")
+    else:
+        # Pydantic-v1:
+        _config = model_cls.__config__
+        _extra = getattr(_config, "extra", None)
+        _alias_generator = getattr(_config, "alias_generator", None)
+
+    if ((_extra is not None) and (_extra != "ignore")) or _alias_generator:
+        return None
+
+    # Model validators that run before field validation receive all input keys:
+    if hasattr(model_cls, "__pydantic_decorators__"):
+        # Pydantic-v2:
+        if any(
+            _validator.info.mode in ("before", "wrap")
+            for _validator in model_cls.__pydantic_decorators__.model_validators.values()
+        ):
+            return None
+    elif getattr(model_cls, "__pre_root_validators__", None):
+        # Pydantic-v1:
+        return None
+
+    _keys = set()
+    for _name, _field in _get_model_fields(model_cls).items():
+        _keys.add(_name)
+        for _alias in (
+            getattr(_field, "alias", None),
+            getattr(_field, "validation_alias", None),
+        ):
+            if _alias is None:
+                continue
+
+            if not isinstance(_alias, str):
+                return None
+
+            _keys.add(_alias)
+
+    return frozenset(_keys)
+
+
+def _is_model_class(obj: Any) -> bool:
+    """Check if an object is a Pydantic model class (Pydantic-v1 or Pydantic-v2).
 
     Args:
-        dict1 (dict, required): The base dictionary that will be merged.
-        dict2 (dict, required): The dictionary to merge into `dict1`.
+        obj (Any, required): Object to check.
 
     Returns:
-        dict: The merged dictionary.
+        bool: True if `obj` is a Pydantic model class, False otherwise.
     """
 
-    _merged = copy.deepcopy(dict1)
-    for _key, _val in dict2.items():
-        if (
-            _key in _merged
-            and isinstance(_merged[_key], dict)
-            and isinstance(_val, dict)
+    return isinstance(obj, type) and (
+        hasattr(obj, "model_construct") or hasattr(obj, "__fields__")
+    )
+
+
+def _get_sub_model_class(field: Any) -> Union[Type[Any], None]:
+    """Return the sub-model class of a Pydantic model field, unwrapping `Optional`/`Union` annotations.
+
+    Args:
+        field (Any, required): Field info of a Pydantic model class.
+
+    Returns:
+        Union[Type[Any], None]: Sub-model class, or None if the field isn't a sub-model or it's ambiguous (union of models).
+    """
+
+    if hasattr(field, "annotation"):
+        # Pydantic-v2:
+        _type = field.annotation
+    else:
+        # Pydantic-v1:
+        _type = field.outer_type_
+
+    if _is_model_class(_type):
+        return _type
+
+    if get_origin(_type) in _UNION_TYPES:
+        _model_classes = [_arg for _arg in get_args(_type) if _is_model_class(_arg)]
+        if len(_model_classes) == 1:
+            return _model_classes[0]
+
+    return None
+
+
+def construct_model(model_cls: Type[Any], data: Dict[str, Any]) -> Any:
+    """Build a Pydantic model from trusted data without running validators.
+    Nested dictionaries are recursively constructed into their sub-model classes,
+    also for `Optional[SubModel]` fields and alias keys. Unions of several sub-models stay dictionaries.
+
+    Args:
+        model_cls (Type[Any]     , required): Pydantic model class to construct.
+        data      (Dict[str, Any], required): Trusted data to construct the model from.
+
+    Returns:
+        Any: Constructed (not validated) model instance.
+    """
+
+    _fields = _get_model_fields(model_cls)
+    # Input keys can also be field aliases:
+    _key_fields = dict(_fields)
+    for _field in _fields.values():
+        for _alias in (
+            getattr(_field, "alias", None),
+            getattr(_field, "validation_alias", None),
         ):
-            _merged[_key] = deep_merge(_merged[_key], _val)
-        else:
-            _merged[_key] = copy.deepcopy(_val)
+            if isinstance(_alias, str):
+                _key_fields.setdefault(_alias, _field)
+
+    _data = {}
+    for _key, _val in data.items():
+        _field = _key_fields.get(_key)
+        if (_field is not None) and isinstance(_val, dict):
+            _sub_model_cls = _get_sub_model_class(_field)
+            if _sub_model_cls is not None:
+                _val = construct_model(_sub_model_cls, _val)
+
+        _data[_key] = _val
+
+    if hasattr(model_cls, "model_construct"):
+        return model_cls.model_construct(**_data)
 
-    return _merged
+    return model_cls.construct(**_data)
@@ -17,3 +17,20 @@ def setup_and_teardown():
 
     # Equivalent of tearDown
     logger.info("Tearing down!")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def import_lazy_modules():
+    # Modules imported lazily by `onion_config` are imported once here,
+    # so the first test that loads YAML or dotenv files doesn't pay for it:
+    import yaml
+    import dotenv
+
+
+@pytest.fixture(autouse=True)
+def log_test(request: pytest.FixtureRequest):
+    logger.debug("Testing '%s'...", request.node.name)
+
+    yield
+
+    logger.debug("Done: '%s'.\n", request.node.name)
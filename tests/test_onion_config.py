@@ -1,102 +1,166 @@
 # -*- coding: utf-8 -*-
 
 import os
-import logging
+import sys
+import math
+import time
+import shutil
+import weakref
+import concurrent.futures
 from pathlib import Path
-from typing import Callable, Tuple, Dict, Any
+from types import MappingProxyType
+from collections import OrderedDict
+from unittest import mock
+from typing import Callable, Tuple, Mapping, Any, Optional, Union
 
 import pytest
-import pydantic
-from pydantic import Field
-
-_has_pydantic_settings = False
-if "2.0.0" <= pydantic.__version__:
-    try:
-        import pydantic_settings
-
-        _has_pydantic_settings = True
-    except ImportError:
-        pass
+from loguru import logger
+from pydantic import BaseModel, Field, ValidationError
 
 try:
-    from onion_config import ConfigLoader, BaseConfig, WarnEnum
+    from onion_config import ConfigLoader, BaseConfig, WarnEnum, format_config
 except ImportError:
-    from src.onion_config import ConfigLoader, BaseConfig, WarnEnum
+    from src.onion_config import ConfigLoader, BaseConfig, WarnEnum, format_config
 
 
-logger = logging.getLogger(__name__)
+# Model to dictionary serializer, bound once for the installed pydantic version (`model_dump` is pydantic-v2 only):
+_dump = (
+    (lambda model: model.model_dump())
+    if hasattr(BaseModel, "model_dump")
+    else (lambda model: model.dict())
+)
 
 
-@pytest.fixture
-def config_loader() -> ConfigLoader:
-    _config_loader = ConfigLoader()
+# Test schemas are defined once, so their models are not rebuilt for every test:
+class _ConfigSchema(BaseConfig):
+    test_var: str = Field("default_val", min_length=2, max_length=32)
+
+
+class _EmptyConfigSchema(BaseConfig):
+    pass
+
+
+class _AppConfig(BaseConfig):
+    port: int = Field(8000, ge=80, lt=65536)
+
+
+class _AppConfigSchema(BaseConfig):
+    app: _AppConfig = Field(...)
 
-    yield _config_loader
 
-    del _config_loader
+class _OptionalAppConfigSchema(BaseModel):
+    app: Optional[_AppConfig] = Field(None)
+    other_app: Union[_AppConfig, None] = Field(None, alias="otherApp")
+
+
+class _ModelConfigSchema(BaseModel):
+    name: str = Field("default")
+    port: int = Field(8000, alias="app_port")
+
+
+# Before validator receives raw input, for pydantic-v2 or pydantic-v1:
+if hasattr(BaseModel, "model_validate"):
+    from pydantic import model_validator
+
+    _before_validator = model_validator(mode="before")
+else:
+    from pydantic import root_validator
+
+    _before_validator = root_validator(pre=True, allow_reuse=True)
+
+
+class _ValidatorConfigSchema(BaseModel):
+    url: str = Field("")
+
+    @_before_validator
+    def _build_url(cls, values):
+        if "host" in values:
+            values = {**values, "url": f"http://{values['host']}"}
+
+        return values
 
 
 @pytest.fixture
-def configs_dir(tmp_path: Path) -> Tuple[str, Dict[str, Any]]:
-    _tmp_configs_dir_pl = tmp_path / "configs"
-    _tmp_configs_dir_pl.mkdir()
-    _tmp_json_file_pl = (_tmp_configs_dir_pl / "test.json").resolve()
-    _tmp_json_file_pl.write_text(
-        '{"json_test": {"str_val": "some_value", "int_val": 123} }'
+def config_loader() -> ConfigLoader:
+    return ConfigLoader()
+
+
+@pytest.fixture(scope="session")
+def configs_dir(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Tuple[str, Mapping[str, Any]]:
+    # Config files are written once per session, tests must not modify them:
+    _tmp_configs_dir_pl = tmp_path_factory.mktemp("configs")
+    _tmp_json_file_pl = _tmp_configs_dir_pl / "test.json"
+    _tmp_json_file_pl.write_bytes(
+        b'{"json_test": {"str_val": "some_value", "int_val": 123} }'
     )
-    _tmp_yaml_file_pl = (_tmp_configs_dir_pl / "test.yml").resolve()
-    _tmp_yaml_file_pl.write_text("yaml_test: true")
+    _tmp_yaml_file_pl = _tmp_configs_dir_pl / "test.yml"
+    _tmp_yaml_file_pl.write_bytes(b"yaml_test: true")
     _tmp_configs_dir = str(_tmp_configs_dir_pl)
-    _expected = {
-        "json_test": {"str_val": "some_value", "int_val": 123},
-        "yaml_test": True,
-    }
+    # Read-only, because it is shared by all tests:
+    _expected = MappingProxyType(
+        {
+            "json_test": MappingProxyType({"str_val": "some_value", "int_val": 123}),
+            "yaml_test": True,
+        }
+    )
 
-    yield _tmp_configs_dir, _expected
+    return _tmp_configs_dir, _expected
 
-    del (
-        _tmp_configs_dir_pl,
-        _tmp_json_file_pl,
-        _tmp_yaml_file_pl,
-        _tmp_configs_dir,
-        _expected,
-    )
 
+@pytest.fixture(scope="session")
+def dotenv_file(tmp_path_factory: pytest.TempPathFactory) -> str:
+    # All dotenv test cases share one file, written once per session:
+    _tmp_env_file_pl = tmp_path_factory.mktemp("envs") / ".env"
+    _tmp_env_file_pl.write_bytes(b"ENV=test\nDEBUG=false\nTEST_ENV_VAR=123\n")
+
+    return str(_tmp_env_file_pl)
 
-def test_init(config_loader: ConfigLoader):
-    logger.info("Testing initialization of 'ConfigLoader'...")
 
+def test_init(config_loader: ConfigLoader):
     assert isinstance(config_loader, ConfigLoader)
-    assert isinstance(config_loader.configs_dirs, list)
+    assert (
+        type(config_loader.configs_dirs),
+        type(config_loader.required_envs),
+        type(config_loader.env_file_paths),
+        type(config_loader.config_data),
+    ) == (list, list, list, dict)
     assert config_loader.configs_dirs == [ConfigLoader._CONFIGS_DIR]
     assert issubclass(config_loader.config_schema, BaseConfig)
     assert config_loader.config_schema == BaseConfig
-    assert isinstance(config_loader.required_envs, list)
     assert config_loader.required_envs == []
     assert isinstance(config_loader.pre_load_hook, Callable)
     assert config_loader.pre_load_hook == ConfigLoader._PRE_LOAD_HOOK
-    assert isinstance(config_loader.env_file_paths, list)
     assert config_loader.env_file_paths == [ConfigLoader._ENV_FILE_PATH]
     assert config_loader.extra_dir == None
-    assert isinstance(config_loader.config_data, dict)
     assert config_loader.config_data == {}
     assert isinstance(config_loader.warn_mode, WarnEnum)
     assert config_loader.warn_mode == WarnEnum.IGNORE
+    assert config_loader.override_envs == True
     assert config_loader.config == None
 
-    logger.info("Done: Initialization of 'ConfigLoader'.\n")
+    # Default containers are not shared between instances:
+    _other_config_loader = ConfigLoader()
+    config_loader.required_envs.append("SHARED_ENV_VAR")
+    config_loader.config_data["shared_key"] = "shared_value"
+    assert _other_config_loader.required_envs == []
+    assert _other_config_loader.config_data == {}
 
 
-def test_load(config_loader: ConfigLoader):
-    logger.info("Testing 'load' method...")
+def test_init_slots(config_loader: ConfigLoader):
+    # Instances can be weak-referenced, but have no arbitrary attributes:
+    assert weakref.ref(config_loader)() is config_loader
+    with pytest.raises(AttributeError):
+        config_loader.unknown_attr = "value"
 
+
+def test_load(config_loader: ConfigLoader):
     _config: BaseConfig = config_loader.load()
 
     assert isinstance(_config, BaseConfig)
     assert config_loader.config == _config
 
-    logger.info("Done: 'load' method.")
-
 
 @pytest.mark.parametrize(
     "config_schema, configs_dirs, env_file_paths, required_envs, pre_load_hook, extra_dir, config_data, warn_mode, expected",
@@ -125,8 +189,6 @@ def test_config_load(
     warn_mode,
     expected,
 ):
-    logger.info("Testing main config cases...")
-
     _config = ConfigLoader(
         config_schema=config_schema,
         configs_dirs=configs_dirs,
@@ -139,47 +201,117 @@ def test_config_load(
     ).load()
 
     assert isinstance(_config, config_schema)
-    if _has_pydantic_settings:
-        assert _config.model_dump() == expected
-    else:
-        assert _config.dict() == expected
-
-    logger.info("Done: Main config cases.\n")
+    assert _dump(_config) == expected
 
 
 @pytest.mark.parametrize(
-    "content, expected",
+    "env_var, expected",
     [
-        ("ENV=test", "test"),
-        ("DEBUG=false", "false"),
-        ("TEST_ENV_VAR=123", "123"),
+        ("ENV", "test"),
+        ("DEBUG", "false"),
+        ("TEST_ENV_VAR", "123"),
     ],
 )
 def test_load_dotenv_files(
-    tmp_path: Path, config_loader: ConfigLoader, content: str, expected: str
+    config_loader: ConfigLoader, dotenv_file: str, env_var: str, expected: str
 ):
-    logger.info("Testing '_load_dotenv_files' method...")
+    config_loader.env_file_paths = dotenv_file
+
+    # Loaded environment variables are restored after the test:
+    with mock.patch.dict(os.environ):
+        config_loader._load_dotenv_files()
+
+        assert config_loader.env_file_paths == [dotenv_file]
+        assert os.getenv(env_var) == expected
+
+
+def test_load_dotenv_files_no_override(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, config_loader: ConfigLoader
+):
+    _tmp_env_file_pl = tmp_path / ".env"
+    _tmp_env_file_pl.write_bytes(b"EXISTING_ENV_VAR=new_value\nNEW_ENV_VAR=new_value")
+    monkeypatch.setenv("EXISTING_ENV_VAR", "old_value")
+
+    config_loader.env_file_paths = str(_tmp_env_file_pl)
+    config_loader.override_envs = False
 
-    _tmp_envs_dir_pl = tmp_path / "envs"
-    _tmp_envs_dir_pl.mkdir()
-    _tmp_env_file_pl = (_tmp_envs_dir_pl / ".env").resolve()
-    _tmp_env_file_pl.write_text(content)
-    _tmp_env_path = str(_tmp_env_file_pl)
+    # Loaded environment variables are restored after the test:
+    with mock.patch.dict(os.environ):
+        config_loader._load_dotenv_files()
 
-    config_loader.env_file_paths = _tmp_env_path
-    config_loader._load_dotenv_files()
-    _env_var = content.split("=")[0]
+        assert os.getenv("EXISTING_ENV_VAR") == "old_value"
+        assert os.getenv("NEW_ENV_VAR") == "new_value"
 
-    assert config_loader.env_file_paths == [_tmp_env_path]
-    assert os.getenv(_env_var) == expected
+    # References are expanded with existing environment variables first, like python-dotenv:
+    _tmp_env_file_pl.write_bytes(
+        b"EXISTING_ENV_VAR=new_value\nREF_ENV_VAR=http://${EXISTING_ENV_VAR}"
+    )
+    with mock.patch.dict(os.environ):
+        config_loader._load_dotenv_files()
+
+        assert os.getenv("REF_ENV_VAR") == "http://old_value"
+
+
+def test_load_dotenv_file_rewritten(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, config_loader: ConfigLoader
+):
+    # Files are old enough to be cached:
+    _now_ns = time.time_ns() + 10_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: _now_ns)
+
+    _tmp_env_file_pl = tmp_path / ".env"
+    _tmp_env_file_pl.write_bytes(b"REWRITTEN_ENV_VAR=1")
+    os.utime(_tmp_env_file_pl, ns=(0, 0))
+    config_loader.env_file_paths = str(_tmp_env_file_pl)
 
-    logger.info("Done: '_load_dotenv_files' method.\n")
+    # Loaded environment variables are restored after the test:
+    with mock.patch.dict(os.environ):
+        config_loader._load_dotenv_files()
+        assert os.getenv("REWRITTEN_ENV_VAR") == "1"
 
+        # Same modification time and size, but the change time is updated:
+        _tmp_env_file_pl.write_bytes(b"REWRITTEN_ENV_VAR=2")
+        os.utime(_tmp_env_file_pl, ns=(0, 0))
+        config_loader._load_dotenv_files()
+        assert os.getenv("REWRITTEN_ENV_VAR") == "2"
 
-def test_check_required_envs(config_loader: ConfigLoader):
-    logger.info("Testing '_check_required_envs' method...")
 
-    os.environ["REQUIRED_ENV_VAR"] = "required_value"
+def test_load_dotenv_file_references(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, config_loader: ConfigLoader
+):
+    # Files are old enough to be cached:
+    _now_ns = time.time_ns() + 10_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: _now_ns)
+
+    _tmp_base_env_file_pl = tmp_path / ".env.base"
+    _tmp_base_env_file_pl.write_bytes(b"BASE_REF_VAR=one")
+    _tmp_env_file_pl = tmp_path / ".env"
+    _tmp_env_file_pl.write_bytes(b"REF_VAR=${BASE_REF_VAR}-x\nPLAIN_REF_VAR=plain")
+    config_loader.env_file_paths = [str(_tmp_base_env_file_pl), str(_tmp_env_file_pl)]
+
+    # Loaded environment variables are restored after the test:
+    with mock.patch.dict(os.environ):
+        config_loader._load_dotenv_files()
+        assert os.getenv("REF_VAR") == "one-x"
+        assert os.getenv("PLAIN_REF_VAR") == "plain"
+
+        # Referenced variable is changed in an earlier dotenv file:
+        _tmp_base_env_file_pl.write_bytes(b"BASE_REF_VAR=two")
+        config_loader._load_dotenv_files()
+        assert os.getenv("REF_VAR") == "two-x"
+
+    # Referenced variable is changed in the environment:
+    config_loader.env_file_paths = str(_tmp_env_file_pl)
+    with mock.patch.dict(os.environ, {"BASE_REF_VAR": "three"}):
+        config_loader._load_dotenv_files()
+        assert os.getenv("REF_VAR") == "three-x"
+
+
+def test_check_required_envs(
+    monkeypatch: pytest.MonkeyPatch, config_loader: ConfigLoader
+):
+    monkeypatch.setenv("REQUIRED_ENV_VAR", "required_value")
+    monkeypatch.delenv("NON_EXISTENT_ENV_VAR", raising=False)
 
     config_loader.required_envs = ["REQUIRED_ENV_VAR"]
     config_loader._check_required_envs()
@@ -187,20 +319,17 @@ def test_check_required_envs(config_loader: ConfigLoader):
     assert config_loader.required_envs == ["REQUIRED_ENV_VAR"]
     assert os.getenv("REQUIRED_ENV_VAR") == "required_value"
 
+    _none_existent_env_var = "NON_EXISTENT_ENV_VAR"
+    config_loader.required_envs = [_none_existent_env_var]
+    assert os.getenv(_none_existent_env_var) == None
+
     with pytest.raises(KeyError):
-        _none_existent_env_var = "NON_EXISTENT_ENV_VAR"
-        config_loader.required_envs = [_none_existent_env_var]
         config_loader._check_required_envs()
-        assert os.getenv(_none_existent_env_var) == None
-
-    logger.info("Done: '_check_required_envs' method.\n")
 
 
 def test_load_configs_dirs(
-    config_loader: ConfigLoader, configs_dir: Tuple[str, Dict[str, Any]]
+    config_loader: ConfigLoader, configs_dir: Tuple[str, Mapping[str, Any]]
 ):
-    logger.info("Testing '_load_configs_dirs' method...")
-
     _configs_dir, _expected = configs_dir
     config_loader.configs_dirs = [_configs_dir]
     config_loader._load_configs_dirs()
@@ -211,28 +340,123 @@ def test_load_configs_dirs(
     assert config_loader.config_data["yaml_test"] == True
     assert config_loader.config_data == _expected
 
-    logger.info("Done: '_load_configs_dirs' method.\n")
 
+def test_load_configs_dirs_dict_subclass(
+    config_loader: ConfigLoader, configs_dir: Tuple[str, Mapping[str, Any]]
+):
+    _configs_dir, _ = configs_dir
+    # Dictionary subclasses in `config_data` are merged, not replaced:
+    config_loader.config_data = {"json_test": OrderedDict(base_val=1)}
+    config_loader.configs_dirs = [_configs_dir]
+    config_loader._load_configs_dirs()
 
-def test_load_extra_dir(
-    tmp_path, config_loader: ConfigLoader, configs_dir: Tuple[str, Dict[str, Any]]
+    assert config_loader.config_data["json_test"] == {
+        "base_val": 1,
+        "str_val": "some_value",
+        "int_val": 123,
+    }
+
+
+def test_load_configs_dirs_cached(
+    config_loader: ConfigLoader, configs_dir: Tuple[str, Mapping[str, Any]]
 ):
-    logger.info("Testing '_load_extra_dir' method...")
+    _configs_dir, _expected = configs_dir
+    config_loader.configs_dirs = [_configs_dir]
+    config_loader._load_configs_dirs()
+    config_loader.config_data["json_test"]["str_val"] = "changed_value"
+
+    config_loader.config_data = {}
+    config_loader._load_configs_dirs()
+
+    assert config_loader.config_data == _expected
+
+
+def test_get_config_file_paths_cached(tmp_path: Path, config_loader: ConfigLoader):
+    _tmp_configs_dir_pl = tmp_path / "configs"
+    _tmp_configs_dir_pl.mkdir()
+    (_tmp_configs_dir_pl / "1.yml").write_bytes(b"first: true")
+    (_tmp_configs_dir_pl / "ignored.txt").write_bytes(b"ignored")
+    os.utime(_tmp_configs_dir_pl, ns=(0, 1_000_000_000))
+
+    _configs_dir = str(_tmp_configs_dir_pl)
+    _file_paths = config_loader._get_config_file_paths(configs_dir=_configs_dir)
+    assert _file_paths == [str(_tmp_configs_dir_pl / "1.yml")]
+
+    _file_paths.append("not_cached.yml")
+    assert config_loader._get_config_file_paths(configs_dir=_configs_dir) == [
+        str(_tmp_configs_dir_pl / "1.yml")
+    ]
+
+    # Adding a file changes the modification time of the directory:
+    (_tmp_configs_dir_pl / "2.json").write_bytes(b'{"second": true}')
+    os.utime(_tmp_configs_dir_pl, ns=(0, 2_000_000_000))
+    assert config_loader._get_config_file_paths(configs_dir=_configs_dir) == [
+        str(_tmp_configs_dir_pl / "1.yml"),
+        str(_tmp_configs_dir_pl / "2.json"),
+    ]
+
+
+def test_load_configs_dirs_parallel(tmp_path: Path, config_loader: ConfigLoader):
+    _tmp_configs_dir_pl = tmp_path / "configs"
+    _tmp_configs_dir_pl.mkdir()
+    _files_count = ConfigLoader._PARALLEL_MIN_FILES + 1
+    for _i in range(_files_count):
+        (_tmp_configs_dir_pl / f"{_i}.yml").write_text(f"order: {_i}\nfile_{_i}: true")
+
+    config_loader.configs_dirs = [str(_tmp_configs_dir_pl)]
+    config_loader._load_configs_dirs()
+
+    assert config_loader.config_data["order"] == _files_count - 1
+    assert all(config_loader.config_data[f"file_{_i}"] for _i in range(_files_count))
+
+
+def test_load_configs_dirs_parallel_cached(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, config_loader: ConfigLoader
+):
+    # Files are old enough to be cached:
+    _now_ns = time.time_ns() + 10_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: _now_ns)
+
+    _tmp_configs_dir_pl = tmp_path / "configs"
+    _tmp_configs_dir_pl.mkdir()
+    _files_count = ConfigLoader._PARALLEL_MIN_FILES + 1
+    for _i in range(_files_count):
+        (_tmp_configs_dir_pl / f"{_i}.yml").write_text(f"order: {_i}\nfile_{_i}: true")
 
+    config_loader.configs_dirs = [str(_tmp_configs_dir_pl)]
+    config_loader._load_configs_dirs()
+
+    # All files are cached now, no thread pool is needed:
+    def _thread_pool_executor(*args, **kwargs):
+        raise AssertionError("ThreadPoolExecutor must not be created!")
+
+    monkeypatch.setattr(concurrent.futures, "ThreadPoolExecutor", _thread_pool_executor)
+    config_loader.config_data = {}
+    config_loader._load_configs_dirs()
+
+    assert config_loader.config_data["order"] == _files_count - 1
+    assert all(config_loader.config_data[f"file_{_i}"] for _i in range(_files_count))
+
+
+def test_load_extra_dir(
+    tmp_path, config_loader: ConfigLoader, configs_dir: Tuple[str, Mapping[str, Any]]
+):
     _configs_dir, _expected = configs_dir
     config_loader.configs_dirs = [_configs_dir]
     config_loader._load_configs_dirs()
 
     _tmp_extra_dir_pl = tmp_path / "extra_dir"
     _tmp_extra_dir_pl.mkdir()
-    _tmp_yaml_file_pl = (_tmp_extra_dir_pl / "test.yaml").resolve()
-    _tmp_yaml_file_pl.write_text(
-        'json_test:\n  str_val: "updated_val"\n  int_val: 321\nextra_test: "extra_value"'
+    _tmp_yaml_file_pl = _tmp_extra_dir_pl / "test.yaml"
+    _tmp_yaml_file_pl.write_bytes(
+        b'json_test:\n  str_val: "updated_val"\n  int_val: 321\nextra_test: "extra_value"'
     )
     _tmp_extra_dir = str(_tmp_extra_dir_pl)
-    _expected["json_test"]["int_val"] = 321
-    _expected["json_test"]["str_val"] = "updated_val"
-    _expected["extra_test"] = "extra_value"
+    _expected = {
+        **_expected,
+        "json_test": {"str_val": "updated_val", "int_val": 321},
+        "extra_test": "extra_value",
+    }
 
     config_loader.extra_dir = _tmp_extra_dir
     config_loader._load_extra_dir()
@@ -243,169 +467,436 @@ def test_load_extra_dir(
     assert config_loader.config_data["extra_test"] == "extra_value"
     assert config_loader.config_data == _expected
 
-    logger.info("Done: '_load_extra_dir' method.\n")
-
 
 def test_config(config_loader: ConfigLoader):
-    logger.info("Testing 'config' property...")
-
-    class _ConfigSchema(BaseConfig):
-        test_var: str = Field("default_val", min_length=2, max_length=32)
-
     config_loader.config_schema = _ConfigSchema
     config_loader.load()
 
     assert isinstance(config_loader.config, _ConfigSchema)
     assert config_loader.config.test_var == "default_val"
-    if _has_pydantic_settings:
-        assert config_loader.config.model_dump() == {"test_var": "default_val"}
-    else:
-        assert config_loader.config.dict() == {"test_var": "default_val"}
+    assert _dump(config_loader.config) == {"test_var": "default_val"}
 
     config_loader.config = _ConfigSchema(test_var="new_val")
     assert config_loader.config.test_var == "new_val"
-    if _has_pydantic_settings:
-        assert config_loader.config.model_dump() == {"test_var": "new_val"}
-    else:
-        assert config_loader.config.dict() == {"test_var": "new_val"}
+    assert _dump(config_loader.config) == {"test_var": "new_val"}
 
-    with pytest.raises(TypeError):
-        config_loader.config = {"test_var": "invalid_val"}
-        config_loader.config = "invalid_val"
-        config_loader.config = 3.14
-        config_loader.config = False
-        config_loader.config = None
 
-    logger.info("Done: 'config' property.\n")
+def test_config_data(config_loader: ConfigLoader):
+    _config_data = {"test_var": "test_val"}
+    config_loader.config_data = _config_data
 
+    assert isinstance(config_loader.config_data, dict)
+    assert config_loader.config_data == _config_data
+    assert config_loader.config_data["test_var"] == "test_val"
+    assert config_loader.config_data == _config_data
 
-def test_config_schema(config_loader: ConfigLoader):
-    logger.info("Testing 'config_schema' property...")
+    _config_data = {"nested": {"list": [1, 2]}, "tuple": (1, 2), 1: "int_key"}
+    config_loader.config_data = _config_data
+    _config_data["nested"]["list"].append(3)
 
-    class _ConfigSchema(BaseConfig):
-        pass
+    assert config_loader.config_data["nested"]["list"] == [1, 2]
+    assert config_loader.config_data["tuple"] == (1, 2)
+    assert config_loader.config_data[1] == "int_key"
 
-    config_loader.config_schema = _ConfigSchema
-    assert config_loader.config_schema == _ConfigSchema
+    config_loader.config_data = {"nested": {"warn_mode": WarnEnum.ALWAYS}}
 
-    with pytest.raises(TypeError):
-        config_loader.config_schema = "invalid_val"
-        config_loader.config_schema = 3.14
-        config_loader.config_schema = False
-        config_loader.config_schema = None
+    assert type(config_loader.config_data["nested"]["warn_mode"]) is WarnEnum
+    assert config_loader.config_data["nested"]["warn_mode"] is WarnEnum.ALWAYS
 
-    logger.info("Done: 'config_schema' property.\n")
 
+def test_pre_load_hook(config_loader: ConfigLoader):
+    def _pre_load_hook(config_data):
+        return config_data
 
-def test_config_data(config_loader: ConfigLoader):
-    logger.info("Testing 'config_data' property...")
+    config_loader.pre_load_hook = _pre_load_hook
+    _config_data: dict = config_loader.pre_load_hook(config_loader.config_data)
 
-    _config_data = {"test_var": "test_val"}
-    config_loader.config_data = _config_data
+    assert isinstance(_config_data, dict)
+    assert config_loader.pre_load_hook == _pre_load_hook
+
+    def _in_place_pre_load_hook(config_data):
+        config_data["test_var"] = "test_val"
+
+    config_loader.pre_load_hook = _in_place_pre_load_hook
+    config_loader.load()
 
-    assert isinstance(config_loader.config_data, dict)
-    assert config_loader.config_data == _config_data
     assert config_loader.config_data["test_var"] == "test_val"
-    assert config_loader.config_data == _config_data
 
-    with pytest.raises(TypeError):
-        config_loader.config_data = _config_data
-        config_loader.config_data = "invalid_val"
-        config_loader.config_data = 3.14
-        config_loader.config_data = False
-        config_loader.config_data = None
 
-    logger.info("Done: 'config_data' property.\n")
+@pytest.mark.parametrize(
+    "property_name, value, expected",
+    [
+        ("config_schema", _EmptyConfigSchema, _EmptyConfigSchema),
+        ("configs_dirs", "/tmp/pytest/configs_dir", ["/tmp/pytest/configs_dir"]),
+        ("extra_dir", "/tmp/pytest/extra_dir", "/tmp/pytest/extra_dir"),
+        ("env_file_paths", "/tmp/pytest/.env", ["/tmp/pytest/.env"]),
+        ("required_envs", ["TEST_ENV_VAR"], ["TEST_ENV_VAR"]),
+        ("required_envs", [], []),
+        ("warn_mode", "ALWAYS", WarnEnum.ALWAYS),
+        ("override_envs", False, False),
+    ],
+)
+def test_property_values(
+    config_loader: ConfigLoader, property_name: str, value: Any, expected: Any
+):
+    setattr(config_loader, property_name, value)
+    assert getattr(config_loader, property_name) == expected
+
+
+@pytest.mark.parametrize(
+    "property_name, value, exception",
+    [
+        ("config", {"test_var": "invalid_val"}, TypeError),
+        ("config", "invalid_val", TypeError),
+        ("config", 3.14, TypeError),
+        ("config", False, TypeError),
+        ("config", None, TypeError),
+        ("config_schema", "invalid_val", TypeError),
+        ("config_schema", 3.14, TypeError),
+        ("config_schema", False, TypeError),
+        ("config_schema", None, TypeError),
+        ("config_data", "invalid_val", TypeError),
+        ("config_data", 3.14, TypeError),
+        ("config_data", False, TypeError),
+        ("config_data", None, TypeError),
+        ("configs_dirs", 3.14, TypeError),
+        ("configs_dirs", False, TypeError),
+        ("configs_dirs", None, TypeError),
+        ("configs_dirs", "", ValueError),
+        ("extra_dir", 3.14, TypeError),
+        ("extra_dir", False, TypeError),
+        ("extra_dir", None, TypeError),
+        ("extra_dir", "", ValueError),
+        ("env_file_paths", 3.14, TypeError),
+        ("env_file_paths", False, TypeError),
+        ("env_file_paths", None, TypeError),
+        ("env_file_paths", "", ValueError),
+        ("required_envs", "invalid_val", TypeError),
+        ("required_envs", 3.14, TypeError),
+        ("required_envs", False, TypeError),
+        ("required_envs", None, TypeError),
+        ("required_envs", ["TEST_ENV_VAR", 1, None], ValueError),
+        ("pre_load_hook", "invalid_val", TypeError),
+        ("pre_load_hook", 3.14, TypeError),
+        ("pre_load_hook", False, TypeError),
+        ("pre_load_hook", None, TypeError),
+        ("override_envs", "invalid_val", TypeError),
+    ],
+)
+def test_property_invalid_values(
+    config_loader: ConfigLoader, property_name: str, value: Any, exception: type
+):
+    with pytest.raises(exception):
+        setattr(config_loader, property_name, value)
 
 
-def test_configs_dirs(config_loader: ConfigLoader):
-    logger.info("Testing 'configs_dirs' property...")
+def test_load_trusted(config_loader: ConfigLoader):
+    config_loader.config_schema = _AppConfigSchema
+    config_loader.config_data = {"app": {"port": 8443}}
+    _config: _AppConfigSchema = config_loader.load(trusted=True)
 
-    config_loader.configs_dirs = "/tmp/pytest/configs_dir"
-    assert config_loader.configs_dirs == ["/tmp/pytest/configs_dir"]
+    assert isinstance(_config, _AppConfigSchema)
+    assert isinstance(_config.app, _AppConfig)
+    assert _config.app.port == 8443
 
-    with pytest.raises(TypeError):
-        config_loader.configs_dirs = 3.14
-        config_loader.configs_dirs = False
-        config_loader.configs_dirs = None
+    # `Optional`/`Union` sub-models and alias keys are constructed too:
+    config_loader.config_schema = _OptionalAppConfigSchema
+    config_loader.config_data = {"app": {"port": 8443}, "otherApp": {"port": 8080}}
+    _config: _OptionalAppConfigSchema = config_loader.load(trusted=True)
 
-    with pytest.raises(ValueError):
-        config_loader.configs_dirs = ""
+    assert isinstance(_config.app, _AppConfig)
+    assert isinstance(_config.other_app, _AppConfig)
+    assert _config.other_app.port == 8080
 
-    logger.info("Done: 'configs_dirs' property.\n")
 
+def test_load_model_schema(config_loader: ConfigLoader):
+    config_loader.config_schema = _ModelConfigSchema
+    config_loader.config_data = {
+        "name": "test",
+        "app_port": 8443,
+        "unknown_key": "ignored",
+    }
+    _config: _ModelConfigSchema = config_loader.load()
 
-def test_extra_dir(config_loader: ConfigLoader):
-    logger.info("Testing 'extra_dir' property...")
+    assert isinstance(_config, _ModelConfigSchema)
+    assert _config.name == "test"
+    assert _config.port == 8443
+    assert not hasattr(_config, "unknown_key")
+    assert config_loader.config_data["unknown_key"] == "ignored"
 
-    config_loader.extra_dir = "/tmp/pytest/extra_dir"
-    assert config_loader.extra_dir == "/tmp/pytest/extra_dir"
 
-    with pytest.raises(TypeError):
-        config_loader.extra_dir = 3.14
-        config_loader.extra_dir = False
-        config_loader.extra_dir = None
+def test_load_model_schema_validator(config_loader: ConfigLoader):
+    # Unknown keys are not dropped, if the before validator may read them:
+    config_loader.config_schema = _ValidatorConfigSchema
+    config_loader.config_data = {"host": "h"}
+    _config: _ValidatorConfigSchema = config_loader.load()
 
-    with pytest.raises(ValueError):
-        config_loader.extra_dir = ""
+    assert _config.url == "http://h"
 
-    logger.info("Done: 'extra_dir' property.\n")
 
+def test_load_cache(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    configs_dir: Tuple[str, Mapping[str, Any]],
+):
+    # Files are old enough to be cached:
+    _now_ns = time.time_ns() + 10_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: _now_ns)
+
+    # Work on a copy, because the shared configs directory must not be modified:
+    _configs_dir = str(tmp_path / "configs")
+    shutil.copytree(configs_dir[0], _configs_dir)
+    _expected = configs_dir[1]
+    _base = sys.modules[ConfigLoader.__module__]
+    ConfigLoader.clear_cache()
+
+    # Cache is opt-in:
+    ConfigLoader(configs_dirs=_configs_dir).load()
+    assert not _base._LOADED
+
+    _config = ConfigLoader(configs_dirs=_configs_dir).load(cache=True)
+    _config_loader = ConfigLoader(configs_dirs=_configs_dir)
+    _cached_config = _config_loader.load(cache=True)
+
+    assert len(_base._LOADED) == 1
+    assert _cached_config == _config
+    assert _config_loader.config_data == _expected
+
+    _yaml_file_path = os.path.join(_configs_dir, "test.yml")
+    with open(_yaml_file_path, "w", encoding="utf-8") as _file:
+        _file.write("yaml_test: false")
+    os.utime(_yaml_file_path, ns=(0, 0))
+
+    _config_loader = ConfigLoader(configs_dirs=_configs_dir)
+    _config_loader.load(cache=True)
+    assert _config_loader.config_data["yaml_test"] == False
+
+
+def test_load_cache_copies(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Files are old enough to be cached:
+    _now_ns = time.time_ns() + 10_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: _now_ns)
+    monkeypatch.delenv("ONION_CONFIG_STRICT", raising=False)
+
+    _kwargs = {
+        "config_schema": _ModelConfigSchema,
+        "configs_dirs": str(tmp_path / "configs"),
+        "config_data": {"name": "cached", "app_port": "8443"},
+        "warn_mode": "ALWAYS",
+    }
+    ConfigLoader.clear_cache()
 
-def test_env_file_paths(config_loader: ConfigLoader):
-    logger.info("Testing 'env_file_paths' property...")
+    # Modified config doesn't change the cached one:
+    _config = ConfigLoader(**_kwargs).load(cache=True)
+    _config.name = "mutated"
+    assert ConfigLoader(**_kwargs).load(cache=True).name == "cached"
 
-    config_loader.env_file_paths = "/tmp/pytest/.env"
-    assert config_loader.env_file_paths == ["/tmp/pytest/.env"]
+    # Cache hits are logged as successful loads:
+    _messages = []
+    _handler_id = logger.add(_messages.append, level="SUCCESS", format="{message}")
+    try:
+        ConfigLoader(**_kwargs).load(cache=True)
+    finally:
+        logger.remove(_handler_id)
+
+    assert "Successfully loaded all configs!" in [
+        _message.strip() for _message in _messages
+    ]
+
+    # Strict mode validates even configs cached by trusted loads:
+    _kwargs["config_data"] = {"app_port": "notint"}
+    assert ConfigLoader(**_kwargs).load(trusted=True, cache=True).port == "notint"
+    monkeypatch.setenv("ONION_CONFIG_STRICT", "1")
+    with pytest.raises(ValidationError):
+        ConfigLoader(**_kwargs).load(trusted=True, cache=True)
+
+
+def test_load_cache_envs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Files are old enough to be cached:
+    _now_ns = time.time_ns() + 10_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: _now_ns)
+
+    _tmp_env_file_pl = tmp_path / ".env"
+    _tmp_env_file_pl.write_bytes(b"DOTENV_ENV_VAR=dotenv_value")
+    _kwargs = {
+        "config_schema": _ConfigSchema,
+        "configs_dirs": str(tmp_path / "configs"),
+        "env_file_paths": str(_tmp_env_file_pl),
+        "required_envs": ["REQUIRED_ENV_VAR"],
+    }
+    monkeypatch.setenv("REQUIRED_ENV_VAR", "required_value")
+    monkeypatch.setenv("TEST_VAR", "env_val_1")
+
+    _base = sys.modules[ConfigLoader.__module__]
+    ConfigLoader.clear_cache()
+
+    # Loaded environment variables are restored after the test:
+    with mock.patch.dict(os.environ):
+        assert ConfigLoader(**_kwargs).load(cache=True).test_var == "env_val_1"
+        assert ConfigLoader(**_kwargs).load(cache=True).test_var == "env_val_1"
+        assert len(_base._LOADED) == 1
+
+        # Changed environment variables are read by `BaseSettings` schemas:
+        os.environ["TEST_VAR"] = "env_val_2"
+        assert ConfigLoader(**_kwargs).load(cache=True).test_var == "env_val_2"
+
+        # Dotenv files are loaded even for cached configs:
+        del os.environ["DOTENV_ENV_VAR"]
+        ConfigLoader(**_kwargs).load(cache=True)
+        assert os.getenv("DOTENV_ENV_VAR") == "dotenv_value"
+
+        # Required environment variable values are part of the key for any schema:
+        _loaded_count = len(_base._LOADED)
+        _model_kwargs = {**_kwargs, "config_schema": _ModelConfigSchema}
+        ConfigLoader(**_model_kwargs).load(cache=True)
+        os.environ["REQUIRED_ENV_VAR"] = "changed_value"
+        ConfigLoader(**_model_kwargs).load(cache=True)
+        assert len(_base._LOADED) == _loaded_count + 2
+
+        # Required environment variables are checked even for cached configs:
+        del os.environ["REQUIRED_ENV_VAR"]
+        with pytest.raises(KeyError):
+            ConfigLoader(**_kwargs).load(cache=True)
+
+
+def test_read_json_file(tmp_path: Path, config_loader: ConfigLoader):
+    # Values are parsed the same as `json.loads`, even if `orjson` is installed:
+    _json_file_pl = tmp_path / "test.json"
+    _json_file_pl.write_bytes(
+        b'{"big_int": 123456789012345678901234567890, "nan_val": NaN, "inf_val": Infinity}'
+    )
+    _config_data = config_loader._read_config_file(str(_json_file_pl))
 
-    with pytest.raises(TypeError):
-        config_loader.env_file_paths = 3.14
-        config_loader.env_file_paths = False
-        config_loader.env_file_paths = None
+    assert _config_data["big_int"] == 123456789012345678901234567890
+    assert isinstance(_config_data["big_int"], int)
+    assert math.isnan(_config_data["nan_val"])
+    assert _config_data["inf_val"] == math.inf
 
-    with pytest.raises(ValueError):
-        config_loader.env_file_paths = ""
 
-    logger.info("Done: 'env_file_paths' property.\n")
+def test_read_config_file_rewritten(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, config_loader: ConfigLoader
+):
+    # Files are old enough to be cached:
+    _now_ns = time.time_ns() + 10_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: _now_ns)
 
+    _yaml_file_pl = tmp_path / "test.yml"
+    _yaml_file_pl.write_bytes(b"value: 1")
+    os.utime(_yaml_file_pl, ns=(0, 0))
+    _yaml_file_path = str(_yaml_file_pl)
+    assert config_loader._read_config_file(_yaml_file_path)["value"] == 1
 
-def test_required_envs(config_loader: ConfigLoader):
-    logger.info("Testing 'required_envs' property...")
+    # Same modification time and size, but the change time is updated:
+    _yaml_file_pl.write_bytes(b"value: 2")
+    os.utime(_yaml_file_pl, ns=(0, 0))
+    assert config_loader._read_config_file(_yaml_file_path)["value"] == 2
 
-    config_loader.required_envs = ["TEST_ENV_VAR"]
-    assert config_loader.required_envs == ["TEST_ENV_VAR"]
 
-    config_loader.required_envs = []
-    assert config_loader.required_envs == []
+def test_clear_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Files are old enough to be cached:
+    _now_ns = time.time_ns() + 10_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: _now_ns)
 
-    with pytest.raises(TypeError):
-        config_loader.required_envs = "invalid_val"
-        config_loader.required_envs = 3.14
-        config_loader.required_envs = False
-        config_loader.required_envs = None
+    _tmp_configs_dir_pl = tmp_path / "configs"
+    _tmp_configs_dir_pl.mkdir()
+    _yaml_file_pl = _tmp_configs_dir_pl / "test.yml"
+    _yaml_file_pl.write_bytes(b"value: 1")
 
-    with pytest.raises(ValueError):
-        config_loader.required_envs = ["TEST_ENV_VAR", 1, None]
+    _configs_dir = str(_tmp_configs_dir_pl)
+    assert ConfigLoader(configs_dirs=_configs_dir).load().value == 1
 
-    logger.info("Done: 'required_envs' property.\n")
+    _base = sys.modules[ConfigLoader.__module__]
+    assert str(_yaml_file_pl) in _base._PARSE_CACHE
 
+    ConfigLoader.clear_cache()
+    assert not _base._PARSE_CACHE
+    assert ConfigLoader(configs_dirs=_configs_dir).load().value == 1
 
-def test_pre_load_hook(config_loader: ConfigLoader):
-    logger.info("Testing 'pre_load_hook' property...")
 
-    def _pre_load_hook(config_data):
-        return config_data
+def test_load_cache_file(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    configs_dir: Tuple[str, Mapping[str, Any]],
+):
+    _configs_dir, _expected = configs_dir
+    _cache_dir = str(tmp_path / "cache")
+    monkeypatch.setenv("ONION_CONFIG_CACHE_DIR", _cache_dir)
 
-    config_loader.pre_load_hook = _pre_load_hook
-    _config_data: dict = config_loader.pre_load_hook(config_loader.config_data)
+    # Recently changed files are not saved into the cache file:
+    _new_configs_dir_pl = tmp_path / "new_configs"
+    _new_configs_dir_pl.mkdir()
+    (_new_configs_dir_pl / "test.yml").write_bytes(b"new_test: true")
+    ConfigLoader(configs_dirs=str(_new_configs_dir_pl)).load()
+
+    assert not os.path.exists(_cache_dir)
+
+    # Files are old enough to be cached:
+    _now_ns = time.time_ns() + 10_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: _now_ns)
+
+    _config_loader = ConfigLoader(configs_dirs=_configs_dir)
+    _config_loader.load()
+
+    assert len(os.listdir(_cache_dir)) == 1
+
+    _config_loader = ConfigLoader(configs_dirs=_configs_dir)
+    _cache_file_path, _fingerprint = _config_loader._get_cache_file_info()
+
+    assert _config_loader._load_cache_file(_cache_file_path, _fingerprint) == True
+    assert _config_loader.config_data == _expected
+
+    # Enum values would be loaded back as strings, not saved:
+    _config_loader = ConfigLoader(
+        configs_dirs=_configs_dir, config_data={"warn_mode": WarnEnum.ALWAYS}
+    )
+    _config_loader.load()
+
+    assert len(os.listdir(_cache_dir)) == 1
 
-    assert isinstance(_config_data, dict)
-    assert config_loader.pre_load_hook == _pre_load_hook
 
-    with pytest.raises(TypeError):
-        config_loader.pre_load_hook = "invalid_val"
-        config_loader.pre_load_hook = 3.14
-        config_loader.pre_load_hook = False
-        config_loader.pre_load_hook = None
+def test_prune_cache_dir(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    configs_dir: Tuple[str, Mapping[str, Any]],
+):
+    # Files are old enough to be cached:
+    _now_ns = time.time_ns() + 10_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: _now_ns)
+
+    _configs_dir, _ = configs_dir
+    _cache_dir_pl = tmp_path / "cache"
+    monkeypatch.setenv("ONION_CONFIG_CACHE_DIR", str(_cache_dir_pl))
+    monkeypatch.setattr(ConfigLoader, "_CACHE_FILES_MAXSIZE", 2)
+
+    _cache_dir_pl.mkdir()
+    (_cache_dir_pl / "other.json").write_text("{}")
+    for _i in range(4):
+        ConfigLoader(configs_dirs=_configs_dir, config_data={"run": _i}).load()
+
+    _cache_file_names = os.listdir(_cache_dir_pl)
+
+    assert len(_cache_file_names) == 3
+    assert "other.json" in _cache_file_names
+
+
+def test_format_config():
+    _formatted = format_config(_ConfigSchema())
+
+    assert isinstance(_formatted, str)
+    assert "test_var" in _formatted
+    assert "default_val" in _formatted
+
+
+def test_format_config_fallback(monkeypatch: pytest.MonkeyPatch):
+    _config = _AppConfigSchema(app={"port": 8443})
+    _configs = (
+        _config,
+        _ModelConfigSchema(name="Ünïcode"),
+        BaseConfig(nested={"list": [1, 1.5, True, None, "str"], "empty": {}}),
+    )
+    _formatted = [format_config(_c) for _c in _configs]
 
-    logger.info("Done: 'pre_load_hook' property.\n")
+    # Layout is the same with or without `msgspec`:
+    monkeypatch.setattr(sys.modules[format_config.__module__], "_msgspec", False)
+    assert [format_config(_c) for _c in _configs] == _formatted
+    assert format_config(_config) == '{\n  "app": {\n    "port": 8443\n  }\n}'